@@ -0,0 +1,117 @@
+# Query latency vs concurrent dashboard sessions
+# Runs the dashboard's push-down queries from N concurrent sessions through
+# the pooled engine in pulse_db and reports latency percentiles per N.
+#
+#   python -m benchmarks.bench_db_concurrency                 # SQLite stand-in
+#   python -m benchmarks.bench_db_concurrency --url mysql+mysqlconnector://...
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from pulse_db import create_db_engine, db_settings, pool_status, sql_text
+from pulse_queries import build_aggregate_query
+
+YEARS = range(2018, 2025)
+QUARTERS = range(1, 5)
+
+
+# ========================
+# STAND-IN DATABASE
+# ========================
+def build_standin(engine, rows):
+    """Fill a local database with random map_user / aggregated_transaction rows."""
+    rng = np.random.default_rng(0)
+    states = [f"State {i}" for i in range(36)]
+    periods = [(y, q) for y in YEARS for q in QUARTERS]
+    keys = rng.integers(0, len(periods), rows)
+    map_user = pd.DataFrame({
+        "States": rng.choice(states, rows),
+        "Years": [periods[k][0] for k in keys],
+        "Quarter": [periods[k][1] for k in keys],
+        "District": [f"District {i}" for i in rng.integers(0, 800, rows)],
+        "RegisteredUsers": rng.integers(0, 10_000_000, rows),
+        "AppOpens": rng.integers(0, 100_000_000, rows),
+    })
+    agg = map_user.rename(columns={"District": "Transaction_type", "RegisteredUsers": "Transaction_count",
+                                   "AppOpens": "Transaction_amount"})
+    map_user.to_sql("map_user", engine, index=False, if_exists="replace", chunksize=10_000)
+    agg.to_sql("aggregated_transaction", engine, index=False, if_exists="replace", chunksize=10_000)
+
+
+def dashboard_queries():
+    """A random period's worth of the queries a case-study page issues."""
+    years, quarter = random.choice(YEARS), random.choice(QUARTERS)
+    return [
+        build_aggregate_query("aggregated_transaction", ["Transaction_count", "Transaction_amount"], ["States"],
+                              years=years, quarter=quarter),
+        build_aggregate_query("map_user", ["AppOpens"], ["District"], years=years, quarter=quarter,
+                              order_by="AppOpens", limit=10),
+    ]
+
+
+# ========================
+# BENCHMARK
+# ========================
+def run_session(engine, queries_per_session):
+    latencies = []
+    for _ in range(queries_per_session):
+        for sql, params in dashboard_queries():
+            start = time.perf_counter()
+            with engine.connect() as conn:
+                conn.execute(sql_text(sql), params).fetchall()
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def run(engine, session_counts, queries_per_session):
+    results = []
+    for sessions in session_counts:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            runs = list(executor.map(lambda _: run_session(engine, queries_per_session), range(sessions)))
+        elapsed = time.perf_counter() - start
+        latencies = sorted(ms for session in runs for ms in session)
+        results.append({
+            "sessions": sessions,
+            "queries": len(latencies),
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 2),
+            "max_ms": round(latencies[-1], 2),
+            "qps": round(len(latencies) / elapsed, 1),
+        })
+        print(f"{sessions:>4} sessions  p50 {results[-1]['p50_ms']:>8.2f} ms  p95 {results[-1]['p95_ms']:>8.2f} ms  "
+              f"max {results[-1]['max_ms']:>8.2f} ms  {results[-1]['qps']:>8.1f} q/s  [{pool_status(engine)}]")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dashboard query latency vs concurrent sessions")
+    parser.add_argument("--url", default=None, help="database URL (default: a temporary SQLite stand-in)")
+    parser.add_argument("--sessions", default="1,2,4,8,16,32")
+    parser.add_argument("--queries", type=int, default=20, help="query rounds per session")
+    parser.add_argument("--rows", type=int, default=200_000, help="stand-in rows per table")
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    settings = db_settings()
+    if args.url:
+        engine = create_db_engine(args.url, settings)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "pulse_standin.db")
+        engine = create_db_engine(f"sqlite:///{path}", settings)
+        build_standin(engine, args.rows)
+
+    print(f"pool_size={settings['pool_size']} max_overflow={settings['max_overflow']}")
+    results = run(engine, [int(n) for n in args.sessions.split(",")], args.queries)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"settings": settings, "results": results}, f, indent=1)
@@ -0,0 +1,90 @@
+# Peak memory of the in-memory vs streaming extraction
+# Generates synthetic trees of growing size and exports each one twice, in a
+# fresh process per run so ru_maxrss is that run's own peak: once by
+# building every table in memory (extract_all + export_parquet) and once with
+# pulse_extract.stream_export. Both run serially so the peak is in one process.
+#
+#   python -m benchmarks.bench_extract_memory --scales 1,4 --years 2,7
+
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_pulse import generate_tree
+
+MODES = ("in_memory", "stream")
+
+
+def export(mode, data_root, out, chunk_rows):
+    """Run one export in this process; returns (seconds, peak RSS in MB)."""
+    start = time.perf_counter()
+    if mode == "in_memory":
+        from pulse_extract import extract_all
+        from pulse_store import export_parquet
+        export_parquet(extract_all(data_root, parallel=False), out)
+    else:
+        from pulse_extract import stream_export
+        stream_export(data_root, out, parallel=False, chunk_rows=chunk_rows)
+    seconds = time.perf_counter() - start
+    # ru_maxrss is in KB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return seconds, peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_isolated(mode, data_root, out, chunk_rows):
+    """Run export() in a child process and return its result."""
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_extract_memory", "--child", mode, data_root, out,
+         str(chunk_rows)],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def run_tree(scale, years, workdir, chunk_rows):
+    data_root = os.path.join(workdir, "data")
+    files = generate_tree(data_root, scale, years)
+    row = {"scale": scale, "years": years, "files": files}
+    for mode in MODES:
+        seconds, peak_mb = run_isolated(mode, data_root, os.path.join(workdir, mode), chunk_rows)
+        row[f"{mode}_seconds"] = round(seconds, 3)
+        row[f"{mode}_peak_mb"] = round(peak_mb, 1)
+    return row
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        mode, data_root, out, chunk_rows = sys.argv[2:6]
+        print(json.dumps(export(mode, data_root, out, int(chunk_rows))))
+        raise SystemExit(0)
+
+    parser = argparse.ArgumentParser(description="Peak memory of in-memory vs streaming extraction")
+    parser.add_argument("--scales", default="1,4", help="comma-separated districts multipliers")
+    parser.add_argument("--years", default="2,7", help="comma-separated numbers of years")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'scale':>5} {'years':>5} {'files':>7} {'in-memory MB':>13} {'stream MB':>10} "
+          f"{'in-memory s':>12} {'stream s':>9}")
+    for scale in (int(s) for s in args.scales.split(",")):
+        for years in (int(y) for y in args.years.split(",")):
+            workdir = tempfile.mkdtemp()
+            try:
+                row = run_tree(scale, years, workdir, args.chunk_rows)
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+            results.append(row)
+            print(f"{scale:>5} {years:>5} {row['files']:>7,} {row['in_memory_peak_mb']:>13.1f} "
+                  f"{row['stream_peak_mb']:>10.1f} {row['in_memory_seconds']:>12.2f} {row['stream_seconds']:>9.2f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=1)
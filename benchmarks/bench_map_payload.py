@@ -0,0 +1,71 @@
+# Bytes sent per choropleth, by geometry level
+# Builds the dashboard's state choropleth (geometry keyed by StateKey, as the
+# app serves it) with each simplified geometry level and reports the size of
+# the figure spec st.plotly_chart sends to the browser (raw and gzipped) and
+# the time to build and serialize it.
+#
+#   python pulse_geo.py                      # precompute the levels first
+#   python -m benchmarks.bench_map_payload --out map_payload.json
+
+import argparse
+import gzip
+import json
+import time
+
+import numpy as np
+import plotly.io as pio
+
+from pulse_charts import choropleth_figure
+from pulse_dimensions import Dimensions, key_geometry
+from pulse_geo import GEOJSON_PATH, GEOMETRY_LEVELS, NAME_PROPERTY, count_vertices, load_geometry, pick_level
+from pulse_schema import STATE_DIM
+
+
+def build_map(geojson, df):
+    """The dashboard's map: choropleth_figure over geometry keyed by StateKey."""
+    return choropleth_figure(df, "Amount_M", geojson, value_suffix="₹M")
+
+
+def measure(path=GEOJSON_PATH, repeat=3):
+    results = []
+    for level in GEOMETRY_LEVELS:
+        geometry = load_geometry(level, path)
+        # dim_state as ingest builds it for a tree with every map state
+        dims = Dimensions()
+        dims.add_states([feature["properties"][NAME_PROPERTY] for feature in geometry["features"]], geometry)
+        states = dims.frames()[STATE_DIM]
+        geojson = key_geometry(geometry, states)
+        df = states.assign(Amount_M=np.random.default_rng(0).random(len(states)) * 1e4)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            spec = pio.to_json(build_map(geojson, df), validate=False)
+            timings.append((time.perf_counter() - start) * 1000)
+        results.append({
+            "level": level,
+            "vertices": count_vertices(geojson),
+            "spec_bytes": len(spec.encode()),
+            "gzip_bytes": len(gzip.compress(spec.encode())),
+            "build_ms": round(min(timings), 1),
+        })
+    full = results[0]["spec_bytes"]
+    for row in results:
+        row["vs_full_pct"] = round(100 * row["spec_bytes"] / full, 1)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Choropleth payload size per geometry level")
+    parser.add_argument("--geojson", default=GEOJSON_PATH)
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = measure(args.geojson)
+    for row in results:
+        print(f"{row['level']:<8} {row['vertices']:>9,} vertices  {row['spec_bytes']:>11,} bytes  "
+              f"{row['gzip_bytes']:>10,} gzipped  {row['vs_full_pct']:>6}%  {row['build_ms']:>8} ms")
+    print("Widths -> level: " + ", ".join(f"{w}px {pick_level(w)}" for w in (500, 800, 1200, 1600, 3000)))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=1)
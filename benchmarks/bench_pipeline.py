@@ -0,0 +1,212 @@
+# End-to-end pipeline benchmark on synthetic Pulse data
+# For each scale factor: generate a synthetic tree, then time extraction,
+# the Parquet export, the bulk load (into a local SQLite stand-in for MySQL)
+# with the rollup rebuild, and the aggregations the dashboard pages run,
+# both pushed down to SQL and over the Parquet store.
+#
+#   python -m benchmarks.bench_pipeline --scales 1,10 --out results.json
+#   python -m benchmarks.bench_pipeline --scales 1,10 --compare results.json
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic_pulse import generate_tree
+from bulk_loader import load_dataframe
+from period_index import PeriodIndex
+from pulse_db import create_db_engine, sql_text
+from pulse_extract import extract_all
+from pulse_queries import aggregate_frame, build_aggregate_query
+from pulse_rollups import refresh_rollups
+from pulse_store import export_parquet, read_table
+
+# Slower than the baseline by more than this fraction counts as a regression
+REGRESSION_THRESHOLD = 0.2
+
+# name -> (table, measures, group_by, filter on one period, order_by, limit);
+# the queries the dashboard pages issue, on rollups and on raw tables
+AGGREGATIONS = {
+    "state_map_rollup": ("rollup_transaction_state", ["Transaction_count", "Transaction_amount"], ["States"],
+                         True, None, None),
+    "payment_types_rollup": ("rollup_transaction_type", ["Transaction_count"], ["Transaction_type"],
+                             True, "Transaction_count", 5),
+    "trend_rollup": ("rollup_transaction_period", ["Transaction_amount"], ["Years", "Quarter"],
+                     False, None, None),
+    "state_map_raw": ("aggregated_transaction", ["Transaction_count", "Transaction_amount"], ["States"],
+                      True, None, None),
+    "user_state_raw": ("map_user", ["RegisteredUsers", "AppOpens"], ["States"], True, None, None),
+    "top_districts_raw": ("map_user", ["AppOpens"], ["District"], True, "AppOpens", 10),
+    "totals_raw": ("map_transaction", ["Transaction_count", "Transaction_amount"], [], False, None, None),
+}
+PERIOD = (2020, 2)
+
+
+# ========================
+# STAND-IN DATABASE
+# ========================
+class SQLiteCursor:
+    """DB-API cursor over sqlite3 accepting the loader's %s placeholders."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, sql, params=()):
+        self.cursor.execute(sql.replace("%s", "?"), params)
+
+    def executemany(self, sql, rows):
+        self.cursor.executemany(sql.replace("%s", "?"), rows)
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+class SQLiteConnection:
+    """Enough of a mysql.connector connection for bulk_loader and pulse_rollups."""
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+
+    def cursor(self):
+        return SQLiteCursor(self.db.cursor())
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    def close(self):
+        self.db.close()
+
+
+# ========================
+# TIMING
+# ========================
+def timed(func, repeat=1):
+    """(result of the last call, median seconds over repeat calls)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def run_aggregation(name, engine, store_dir, source):
+    table_name, measures, group_by, period, order_by, limit = AGGREGATIONS[name]
+    years, quarter = PERIOD if period else (None, None)
+    if source == "sql":
+        sql, params = build_aggregate_query(table_name, measures, group_by, years, quarter,
+                                            order_by=order_by, limit=limit)
+        return pd.read_sql(sql_text(sql), engine, params=params)
+    columns = list(dict.fromkeys(group_by + measures))
+    df = read_table(table_name, columns=columns, years=years, quarter=quarter, store_dir=store_dir)
+    return aggregate_frame(df, measures, group_by, order_by, limit=limit)
+
+
+def run_scale(scale, years, workdir, repeat=5):
+    """Time every pipeline stage at one scale factor; returns {stage: seconds}."""
+    data_root = os.path.join(workdir, "data")
+    store_dir = os.path.join(workdir, "exported_parquet")
+    db_path = os.path.join(workdir, "pulse.db")
+    results = {}
+
+    files, generate_seconds = timed(lambda: generate_tree(data_root, scale, years))
+    frames, results["extract"] = timed(lambda: extract_all(data_root))
+    _, results["export_parquet"] = timed(lambda: export_parquet(frames, store_dir))
+
+    conn = SQLiteConnection(db_path)
+    try:
+        start = time.perf_counter()
+        for table_name, df in frames.items():
+            load_dataframe(conn, table_name, df)
+        results["load"] = time.perf_counter() - start
+        _, results["refresh_rollups"] = timed(lambda: refresh_rollups(conn))
+    finally:
+        conn.close()
+
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    for name in AGGREGATIONS:
+        for source in ("sql", "parquet"):
+            _, results[f"{name}[{source}]"] = timed(lambda: run_aggregation(name, engine, store_dir, source), repeat)
+    rollup = read_table("rollup_transaction_state", store_dir=store_dir)
+    index, results["period_index_build"] = timed(lambda: PeriodIndex(rollup), repeat)
+    _, results["period_index_get"] = timed(lambda: index.get(*PERIOD), repeat)
+    engine.dispose()
+
+    return {
+        "scale": scale,
+        "years": years,
+        "files": files,
+        "generate_seconds": round(generate_seconds, 3),
+        "rows": {table_name: len(df) for table_name, df in frames.items()},
+        "seconds": {stage: round(seconds, 6) for stage, seconds in results.items()},
+    }
+
+
+# ========================
+# REPORTING
+# ========================
+def compare(results, baseline):
+    """Print each stage against a saved run; returns the regressed stages."""
+    previous = {run["scale"]: run["seconds"] for run in baseline["runs"]}
+    regressions = []
+    for run in results["runs"]:
+        before = previous.get(run["scale"])
+        if before is None:
+            continue
+        print(f"\nscale {run['scale']}x vs baseline")
+        for stage, seconds in run["seconds"].items():
+            if stage not in before or before[stage] <= 0:
+                continue
+            change = seconds / before[stage] - 1
+            flag = "  REGRESSION" if change > REGRESSION_THRESHOLD else ""
+            print(f"  {stage:<32} {before[stage] * 1000:>10.2f} ms -> {seconds * 1000:>10.2f} ms  "
+                  f"{change:>+7.1%}{flag}")
+            if flag:
+                regressions.append((run["scale"], stage))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the Pulse pipeline on synthetic data")
+    parser.add_argument("--scales", default="1,10", help="comma-separated districts multipliers")
+    parser.add_argument("--years", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per aggregation (median kept)")
+    parser.add_argument("--workdir", default=None, help="keep generated data here (default: temp dir)")
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    parser.add_argument("--compare", default=None, help="baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    results = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "runs": []}
+    for scale in (int(s) for s in args.scales.split(",")):
+        workdir = os.path.join(args.workdir, f"scale_{scale}") if args.workdir else tempfile.mkdtemp()
+        try:
+            run = run_scale(scale, args.years, workdir, args.repeat)
+        finally:
+            if not args.workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+        results["runs"].append(run)
+        print(f"\nscale {scale}x: {run['files']:,} files, {sum(run['rows'].values()):,} rows "
+              f"(generated in {run['generate_seconds']:.1f}s)")
+        for stage, seconds in run["seconds"].items():
+            print(f"  {stage:<32} {seconds * 1000:>10.2f} ms")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f))
+        if regressions:
+            raise SystemExit(f"{len(regressions)} stage(s) regressed by more than {REGRESSION_THRESHOLD:.0%}")
@@ -0,0 +1,149 @@
+# Private vs shared table cache across dashboard worker processes
+# Starts N worker processes at once, each loading the nine base tables the
+# way fetch_table_data does (SQL + compact dtypes) from a SQLite stand-in of
+# the store: once with a private copy per process, once through
+# pulse_shared_cache. Reports how many source loads ran in total, the
+# slowest cold start, and the workers' combined memory, measured as PSS
+# (shared pages split between the processes mapping them) while every worker
+# still holds its tables. PSS needs Linux; elsewhere only RSS is reported.
+#
+#   python -m benchmarks.bench_shared_cache --workers 4 --scale 4 --years 7
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = ("private", "shared")
+
+
+def memory_mb():
+    """(PSS, RSS) of this process in MB; PSS is None without /proc/self/smaps_rollup."""
+    values = {}
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if parts[0] in ("Rss:", "Pss:"):
+                    values[parts[0][:-1]] = int(parts[1]) / 1024
+    except OSError:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        values["Rss"] = peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return values.get("Pss"), values["Rss"]
+
+
+def worker(mode, db_path, cache_dir):
+    """Load every base table like one dashboard process; holds them until told to exit."""
+    import pandas as pd
+
+    from pulse_db import create_db_engine, sql_text
+    from pulse_dtypes import compact_frame
+    from pulse_schema import TABLES
+    from pulse_shared_cache import SharedTableCache
+
+    engine = create_db_engine(f"sqlite:///{db_path}")
+    cache = SharedTableCache(cache_dir) if mode == "shared" else None
+    loads = 0
+    frames = {}
+    start = time.perf_counter()
+    for table_name in TABLES:
+        def loader(table_name=table_name):
+            return compact_frame(pd.read_sql(sql_text(f"SELECT * FROM {table_name}"), engine), table_name)
+        if cache is None:
+            frames[table_name] = loader()
+            loads += 1
+        else:
+            frames[table_name] = cache.get_or_load(("sql", table_name, None, None, None), loader)
+    seconds = time.perf_counter() - start
+    if cache is not None:
+        loads = cache.loads
+    # Measure only once every worker has loaded, so shared pages are split
+    # between all of them
+    print("ready", flush=True)
+    sys.stdin.readline()
+    pss, rss = memory_mb()
+    print(json.dumps({"loads": loads, "seconds": seconds, "pss_mb": pss, "rss_mb": rss,
+                      "rows": sum(len(df) for df in frames.values())}), flush=True)
+    sys.stdin.readline()
+
+
+def run_mode(mode, workers, db_path, cache_dir):
+    """Start the workers together and collect their results once all are loaded."""
+    children = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.bench_shared_cache", "--child", mode, db_path, cache_dir],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        for _ in range(workers)
+    ]
+    for child in children:
+        if child.stdout.readline().strip() != "ready":
+            raise RuntimeError(f"{mode} worker failed")
+    results = []
+    for child in children:
+        child.stdin.write("measure\n")
+        child.stdin.flush()
+        results.append(json.loads(child.stdout.readline()))
+    for child in children:
+        child.communicate("exit\n")
+    pss = [r["pss_mb"] for r in results]
+    return {
+        "mode": mode,
+        "workers": workers,
+        "source_loads": sum(r["loads"] for r in results),
+        "slowest_cold_start_s": round(max(r["seconds"] for r in results), 3),
+        "total_pss_mb": round(sum(pss), 1) if None not in pss else None,
+        "total_rss_mb": round(sum(r["rss_mb"] for r in results), 1),
+        "rows_per_worker": results[0]["rows"],
+    }
+
+
+def build_source(workdir, scale, years):
+    """Synthetic tree -> Parquet store -> SQLite stand-in; returns the database path."""
+    from benchmarks.bench_backends import build_standin
+    from benchmarks.synthetic_pulse import generate_tree
+    from pulse_extract import stream_export
+    from pulse_schema import TABLES
+
+    data_root = os.path.join(workdir, "data")
+    store_dir = os.path.join(workdir, "store")
+    generate_tree(data_root, scale, years)
+    stream_export(data_root, store_dir, parallel=False)
+    engine = build_standin(store_dir, TABLES)
+    return engine.url.database
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        worker(*sys.argv[2:5])
+        raise SystemExit(0)
+
+    parser = argparse.ArgumentParser(description="Private vs shared table cache across worker processes")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--scale", type=int, default=4, help="districts multiplier of the synthetic tree")
+    parser.add_argument("--years", type=int, default=7)
+    parser.add_argument("--out", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    try:
+        db_path = build_source(workdir, args.scale, args.years)
+        results = [run_mode(mode, args.workers, db_path, os.path.join(workdir, "shared_cache"))
+                   for mode in MODES]
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'mode':<8} {'workers':>7} {'source loads':>12} {'slowest s':>10} {'total PSS MB':>13} {'total RSS MB':>13}")
+    for row in results:
+        pss = f"{row['total_pss_mb']:>13.1f}" if row["total_pss_mb"] is not None else f"{'n/a':>13}"
+        print(f"{row['mode']:<8} {row['workers']:>7} {row['source_loads']:>12} "
+              f"{row['slowest_cold_start_s']:>10.2f} {pss} {row['total_rss_mb']:>13.1f}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=1)
@@ -0,0 +1,152 @@
+# Synthetic PhonePe Pulse data
+# Writes a JSON tree with the same aggregated/map/top layout and document
+# shapes as the PhonePe Pulse repository, at a configurable scale, so the
+# extraction/loading/dashboard pipeline can be timed as the data grows.
+#
+#   python -m benchmarks.synthetic_pulse bench_data --scale 10 --years 7
+
+import argparse
+import json
+import os
+import random
+
+# ========================
+# CONFIGURATION
+# ========================
+STATES = [
+    "andaman-&-nicobar-islands", "andhra-pradesh", "arunachal-pradesh", "assam", "bihar",
+    "chandigarh", "chhattisgarh", "dadra-&-nagar-haveli-&-daman-&-diu", "delhi", "goa",
+    "gujarat", "haryana", "himachal-pradesh", "jammu-&-kashmir", "jharkhand", "karnataka",
+    "kerala", "ladakh", "lakshadweep", "madhya-pradesh", "maharashtra", "manipur", "meghalaya",
+    "mizoram", "nagaland", "odisha", "puducherry", "punjab", "rajasthan", "sikkim",
+    "tamil-nadu", "telangana", "tripura", "uttar-pradesh", "uttarakhand", "west-bengal",
+]
+TRANSACTION_TYPES = [
+    "Recharge & bill payments", "Peer-to-peer payments", "Merchant payments",
+    "Financial Services", "Others",
+]
+BRANDS = [
+    "Xiaomi", "Samsung", "Vivo", "Oppo", "OnePlus", "Realme", "Apple", "Motorola",
+    "Lenovo", "Huawei", "Others",
+]
+FIRST_YEAR = 2018
+DISTRICTS_PER_STATE = 20  # at scale 1, about the size of the real data
+TOP_ENTRIES = 10
+# Pulse stopped publishing users by device from this quarter on
+LAST_DEVICE_QUARTER = (2022, 1)
+
+
+# ========================
+# DOCUMENTS
+# ========================
+def _metric(rng, size):
+    count = rng.randint(1_000, 1_000_000) * size
+    return {"type": "TOTAL", "count": count, "amount": count * rng.uniform(100, 2_000)}
+
+
+def transaction_doc(rng, growth):
+    return {"data": {"transactionData": [
+        {"name": name, "paymentInstruments": [_metric(rng, growth)]} for name in TRANSACTION_TYPES
+    ]}}
+
+
+def insurance_doc(rng, growth):
+    return {"data": {"transactionData": [
+        {"name": "Insurance", "paymentInstruments": [_metric(rng, growth)]}
+    ]}}
+
+
+def user_doc(rng, years, quarter):
+    if (years, quarter) > LAST_DEVICE_QUARTER:
+        return {"data": {"usersByDevice": None}}
+    shares = [rng.random() for _ in BRANDS]
+    total = sum(shares)
+    return {"data": {"usersByDevice": [
+        {"brand": brand, "count": int(share * 1e6), "percentage": share / total}
+        for brand, share in zip(BRANDS, shares)
+    ]}}
+
+
+def hover_list_doc(rng, districts, growth):
+    return {"data": {"hoverDataList": [
+        {"name": district, "metric": [_metric(rng, growth)]} for district in districts
+    ]}}
+
+
+def hover_user_doc(rng, districts, growth):
+    return {"data": {"hoverData": {
+        district: {"registeredUsers": rng.randint(1_000, 500_000) * growth,
+                   "appOpens": rng.randint(0, 5_000_000) * growth}
+        for district in districts
+    }}}
+
+
+def top_metric_doc(rng, districts, growth):
+    return {"data": {
+        "districts": [{"entityName": d, "metric": _metric(rng, growth)} for d in districts[:TOP_ENTRIES]],
+        "pincodes": [{"entityName": str(rng.randint(110_000, 855_999)), "metric": _metric(rng, growth)}
+                     for _ in range(TOP_ENTRIES)],
+    }}
+
+
+def top_user_doc(rng, districts, growth):
+    return {"data": {
+        "districts": [{"name": d, "registeredUsers": rng.randint(1_000, 500_000) * growth}
+                      for d in districts[:TOP_ENTRIES]],
+        "pincodes": [{"name": str(rng.randint(110_000, 855_999)), "registeredUsers": rng.randint(100, 50_000)}
+                     for _ in range(TOP_ENTRIES)],
+    }}
+
+
+# ========================
+# TREE
+# ========================
+def _write(path, doc):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(doc, f, separators=(",", ":"))
+
+
+def generate_tree(root, scale=1, years=7, states=None, seed=0):
+    """Write a Pulse-shaped JSON tree under root.
+
+    scale multiplies the districts per state (map tables grow linearly with
+    it); years sets how many years of quarters are written from 2018 on.
+    Returns the number of files written.
+    """
+    rng = random.Random(seed)
+    files = 0
+    for state in states or STATES:
+        name = state.replace("-", " ")
+        districts = [f"{name} district {k}" for k in range(DISTRICTS_PER_STATE * scale)]
+        for years_value in range(FIRST_YEAR, FIRST_YEAR + years):
+            growth = years_value - FIRST_YEAR + 1
+            for quarter in range(1, 5):
+                relative = os.path.join(state, str(years_value), f"{quarter}.json")
+                docs = {
+                    "aggregated/transaction/country/india/state": transaction_doc(rng, growth),
+                    "aggregated/insurance/country/india/state": insurance_doc(rng, growth),
+                    "aggregated/user/country/india/state": user_doc(rng, years_value, quarter),
+                    "map/transaction/hover/country/india/state": hover_list_doc(rng, districts, growth),
+                    "map/insurance/hover/country/india/state": hover_list_doc(rng, districts, growth),
+                    "map/user/hover/country/india/state": hover_user_doc(rng, districts, growth),
+                    "top/transaction/country/india/state": top_metric_doc(rng, districts, growth),
+                    "top/insurance/country/india/state": top_metric_doc(rng, districts, growth),
+                    "top/user/country/india/state": top_user_doc(rng, districts, growth),
+                }
+                for directory, doc in docs.items():
+                    _write(os.path.join(root, directory, relative), doc)
+                    files += 1
+    return files
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic PhonePe Pulse JSON tree")
+    parser.add_argument("root")
+    parser.add_argument("--scale", type=int, default=1, help="districts per state multiplier")
+    parser.add_argument("--years", type=int, default=7, help="years of quarters from 2018")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    count = generate_tree(args.root, args.scale, args.years, seed=args.seed)
+    print(f"{count:,} files written to {args.root}")
@@ -0,0 +1,183 @@
+# PhonePe Pulse bulk loader
+# Loads the exported CSVs into MySQL with batched executemany instead of
+# one INSERT round-trip per row.
+
+import math
+import os
+import time
+
+import mysql.connector
+import pandas as pd
+
+from pulse_dimensions import Dimensions
+from pulse_rollups import refresh_rollups
+from pulse_schema import (ALL_TABLES, DIMENSIONS, DISTRICT_DIM, INDEXES, STATE_DIM, TABLES, create_index_sql,
+                          create_table_sql, delete_keys_sql, insert_sql, table_columns)
+from pulse_store import STORE_DIR, has_table, read_table
+
+# ========================
+# CONFIGURATION
+# ========================
+CSV_DIR = "exported_csv"
+BATCH_SIZE = 5000
+
+
+def parse_years(spec):
+    """'2018-2024' or '2018,2019' -> list of years; empty -> None."""
+    if not spec:
+        return None
+    if "-" in spec:
+        first, last = spec.split("-")
+        return list(range(int(first), int(last) + 1))
+    return [int(y) for y in spec.split(",")]
+
+
+# RANGE partition new base tables by Years (MySQL), e.g. PHONEPE_PARTITION_YEARS=2018-2024
+PARTITION_YEARS = parse_years(os.environ.get("PHONEPE_PARTITION_YEARS"))
+
+
+def get_connection(host="localhost", user="root", password="12345", database="phonepe_db"):
+    """Open a MySQL connection for loading."""
+    return mysql.connector.connect(host=host, user=user, password=password, database=database)
+
+
+# ========================
+# ROW BATCHING
+# ========================
+def _clean(value):
+    """Turn pandas NaN/NA into None so MySQL stores NULL."""
+    if value is pd.NA or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def iter_batches(df, columns, batch_size=BATCH_SIZE):
+    """Yield lists of row tuples, converting NaN to None on the fly."""
+    batch = []
+    for row in df[columns].itertuples(index=False, name=None):
+        batch.append(tuple(_clean(value) for value in row))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ========================
+# LOADING
+# ========================
+def ensure_indexes(cursor, table_name):
+    """Create a table's secondary indexes (pulse_schema.INDEXES) if missing."""
+    for index_name, columns in INDEXES.get(table_name, ()):
+        try:
+            cursor.execute(create_index_sql(table_name, index_name, columns))
+        except Exception as e:
+            # MySQL has no CREATE INDEX IF NOT EXISTS; 1061 is "Duplicate key name"
+            if getattr(e, "errno", None) != 1061 and "already exists" not in str(e):
+                raise
+
+
+def load_dataframe(conn, table_name, df, batch_size=BATCH_SIZE, replace_keys=None,
+                   partition_years=PARTITION_YEARS, replace_all=False):
+    """Insert a DataFrame into a table in batches inside one transaction.
+
+    replace_keys is an optional list of (States, Years, Quarter) tuples whose
+    existing rows are deleted in the same transaction, so re-loading a quarter
+    replaces it instead of duplicating it; replace_all empties the table
+    first (full loads). partition_years only applies when a base table is
+    created.
+    """
+    columns = table_columns(table_name)
+    query = insert_sql(table_name)
+    cursor = conn.cursor()
+    cursor.execute(create_table_sql(table_name, partition_years if table_name in TABLES else None))
+    ensure_indexes(cursor, table_name)
+
+    start = time.perf_counter()
+    rows = 0
+    try:
+        if replace_all:
+            cursor.execute(f"DELETE FROM {table_name}")
+        if replace_keys:
+            cursor.executemany(delete_keys_sql(table_name), list(replace_keys))
+        for batch in iter_batches(df, columns, batch_size):
+            cursor.executemany(query, batch)
+            rows += len(batch)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    seconds = time.perf_counter() - start
+    return {
+        "table": table_name,
+        "mode": "replace" if replace_all else "upsert" if replace_keys else "insert",
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": round(rows / seconds) if seconds > 0 else 0,
+    }
+
+
+def read_exported(table_name, csv_dir=CSV_DIR, store_dir=STORE_DIR):
+    """Read an extracted table, preferring the Parquet store over the CSV."""
+    if store_dir and has_table(table_name, store_dir):
+        return read_table(table_name, store_dir=store_dir)
+    return pd.read_csv(os.path.join(csv_dir, ALL_TABLES[table_name]["csv"]))
+
+
+def load_table(conn, table_name, csv_dir=CSV_DIR, batch_size=BATCH_SIZE, store_dir=STORE_DIR):
+    """Read one exported table and bulk load it into MySQL.
+
+    The export is the whole table, so it replaces the current rows in the
+    same transaction: re-running a load does not hit the primary keys.
+    """
+    df = read_exported(table_name, csv_dir, store_dir)
+    return load_dataframe(conn, table_name, df, batch_size, replace_all=True)
+
+
+def read_dimensions(conn):
+    """Dimensions already loaded into MySQL (empty before the first load)."""
+    frames = {}
+    cursor = conn.cursor()
+    try:
+        for table_name in DIMENSIONS:
+            cursor.execute(create_table_sql(table_name))
+            columns = table_columns(table_name)
+            cursor.execute(f"SELECT {', '.join(columns)} FROM {table_name}")
+            frames[table_name] = pd.DataFrame(cursor.fetchall(), columns=columns)
+        conn.commit()
+    finally:
+        cursor.close()
+    return Dimensions(frames[STATE_DIM], frames[DISTRICT_DIM])
+
+
+def load_all_tables(conn, csv_dir=CSV_DIR, batch_size=BATCH_SIZE, tables=None, store_dir=STORE_DIR,
+                    rollups=True):
+    """Bulk load every exported table and print rows/sec per table.
+
+    Each table replaces its current rows, so a populated database can be
+    reloaded; if a table fails, re-running the load finishes the job. The
+    dimension tables are loaded first, and the rollup tables are rebuilt
+    afterwards unless rollups=False.
+    """
+    stats = []
+    for table_name in tables or list(DIMENSIONS) + list(TABLES):
+        result = load_table(conn, table_name, csv_dir, batch_size, store_dir)
+        print(f"{table_name:<25} {result['rows']:>10,} rows  "
+              f"{result['seconds']:>8.2f}s  {result['rows_per_sec']:>10,} rows/sec")
+        stats.append(result)
+    if rollups:
+        start = time.perf_counter()
+        refresh_rollups(conn)
+        print(f"{'rollups':<25} rebuilt in {time.perf_counter() - start:.2f}s")
+    return stats
+
+
+if __name__ == "__main__":
+    connection = get_connection()
+    try:
+        load_all_tables(connection)
+    finally:
+        connection.close()
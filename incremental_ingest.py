@@ -0,0 +1,162 @@
+# PhonePe Pulse incremental ingestion
+# Keeps a manifest of the JSON files already loaded (size, mtime, sha1) so a
+# quarterly refresh only parses and upserts the new or changed files, and
+# removes the quarters of deleted ones.
+
+import argparse
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from bulk_loader import BATCH_SIZE, get_connection, load_dataframe, read_dimensions
+from pulse_extract import DATA_ROOT, DATASETS, extract_files, state_root
+from pulse_rollups import refresh_rollups
+from pulse_schema import DIMENSIONS, table_columns
+
+# ========================
+# CONFIGURATION
+# ========================
+MANIFEST_PATH = "ingest_manifest.json"
+
+
+# ========================
+# MANIFEST
+# ========================
+def load_manifest(path=MANIFEST_PATH):
+    """Read the manifest of ingested files; empty if it does not exist yet."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the manifest atomically so an interrupted run cannot corrupt it."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def file_sha1(path):
+    """sha1 of a file's contents."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def scan_changes(data_root=DATA_ROOT, manifest=None, tables=None):
+    """Find new, changed or deleted quarter files.
+
+    Returns (changes, entries, removed): changes maps table -> {state:
+    [(year, file)]} in the form extract_files expects, entries maps table ->
+    {manifest key: signature} for the files to record once that table is
+    loaded, and removed maps table -> {state: [(year, file)]} for files in
+    the manifest that no longer exist. Files whose size and mtime are
+    unchanged are skipped without being read; if only the mtime moved, the
+    sha1 decides.
+    """
+    manifest = manifest or {}
+    changes, entries, removed = {}, {}, {}
+    for table_name in tables or DATASETS:
+        for key in manifest:
+            name, state, year, file = key.split("/")
+            if name == table_name and not os.path.exists(os.path.join(state_root(data_root, name), state, year, file)):
+                removed.setdefault(table_name, {}).setdefault(state, []).append((year, file))
+        root = state_root(data_root, table_name)
+        for state in sorted(os.listdir(root)):
+            for year in sorted(os.listdir(os.path.join(root, state))):
+                for file in sorted(os.listdir(os.path.join(root, state, year))):
+                    path = os.path.join(root, state, year, file)
+                    key = "/".join((table_name, state, year, file))
+                    stat = os.stat(path)
+                    signature = {"size": stat.st_size, "mtime": stat.st_mtime}
+                    previous = manifest.get(key)
+                    if previous and previous["size"] == signature["size"] and previous["mtime"] == signature["mtime"]:
+                        continue
+                    signature["sha1"] = file_sha1(path)
+                    entries.setdefault(table_name, {})[key] = signature
+                    if previous and previous.get("sha1") == signature["sha1"]:
+                        continue
+                    changes.setdefault(table_name, {}).setdefault(state, []).append((year, file))
+    return changes, entries, removed
+
+
+def changed_keys(states, dims):
+    """(States, Years, Quarter) keys covered by a table's changed files, with canonical state names."""
+    return [
+        (dims.state_name(state), int(year), int(os.path.splitext(file)[0]))
+        for state, files in states.items()
+        for year, file in files
+    ]
+
+
+# ========================
+# INGESTION
+# ========================
+def ingest_incremental(conn, data_root=DATA_ROOT, manifest_path=MANIFEST_PATH,
+                       batch_size=BATCH_SIZE, workers=None, tables=None):
+    """Parse only new/changed files and upsert their keys into MySQL.
+
+    New states and districts are added to the dimension tables first,
+    keeping the existing keys. Each table is then upserted in its own
+    transaction, and the keys of deleted files are removed with it. The
+    rollups are rebuilt for the (Years, Quarter) periods that changed, and
+    only then is the manifest saved: a failure anywhere leaves the files
+    pending, so the next run re-applies them (upserts are idempotent) and
+    repairs the rollups.
+    """
+    manifest = load_manifest(manifest_path)
+    changes, entries, removed = scan_changes(data_root, manifest, tables)
+    frames = {}
+    dims = read_dimensions(conn) if changes or removed else None
+    if changes:
+        frames = extract_files(data_root, changes, workers, dims=dims)
+        for dim_name in DIMENSIONS:
+            load_dataframe(conn, dim_name, frames[dim_name], batch_size, replace_all=True)
+
+    stats = []
+    periods = set()
+    for table_name in sorted(set(changes) | set(removed)):
+        keys = changed_keys(changes.get(table_name, {}), dims) + changed_keys(removed.get(table_name, {}), dims)
+        df = frames.get(table_name, pd.DataFrame(columns=table_columns(table_name)))
+        result = load_dataframe(conn, table_name, df, batch_size, replace_keys=keys)
+        print(f"{table_name:<25} {sum(len(f) for f in changes.get(table_name, {}).values()):>6} files  "
+              f"{sum(len(f) for f in removed.get(table_name, {}).values()):>4} deleted  "
+              f"{result['rows']:>10,} rows  {result['rows_per_sec']:>10,} rows/sec")
+        stats.append(result)
+        periods.update((years, quarter) for _, years, quarter in keys)
+
+    if periods:
+        refresh_rollups(conn, sorted(periods))
+    else:
+        print("No new or changed files.")
+
+    for table_entries in entries.values():
+        manifest.update(table_entries)
+    for table_name, states in removed.items():
+        for state, files in states.items():
+            for year, file in files:
+                manifest.pop("/".join((table_name, state, year, file)))
+    if entries or removed:
+        save_manifest(manifest, manifest_path)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally ingest new PhonePe Pulse files")
+    parser.add_argument("data_root", nargs="?", default=DATA_ROOT)
+    parser.add_argument("--manifest", default=MANIFEST_PATH)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    connection = get_connection()
+    try:
+        ingest_incremental(connection, args.data_root, args.manifest, args.batch_size, args.workers)
+    finally:
+        connection.close()
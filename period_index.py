@@ -0,0 +1,55 @@
+# In-memory period index for dashboard tables
+# Partitions a frame by (Years, Quarter) once so selecting a period is a
+# dict lookup instead of a boolean-mask scan over the whole frame.
+
+import pandas as pd
+
+
+class PeriodIndex:
+    """A DataFrame pre-partitioned by (Years, Quarter)."""
+
+    def __init__(self, df):
+        self.columns = list(df.columns)
+        # Zero-row frame with the table's dtypes, returned for missing periods
+        self._empty = df.iloc[:0]
+        self.slices = {}
+        if not df.empty:
+            for (years, quarter), part in df.groupby(["Years", "Quarter"], sort=True):
+                self.slices[(int(years), int(quarter))] = part.reset_index(drop=True)
+        self.periods = list(self.slices)
+        self.years = sorted({years for years, _ in self.periods})
+        self.quarters = {
+            years: sorted(quarter for y, quarter in self.periods if y == years) for years in self.years
+        }
+
+    @property
+    def empty(self):
+        return not self.slices
+
+    def latest(self):
+        """Most recent (Years, Quarter), or None when empty."""
+        return self.periods[-1] if self.periods else None
+
+    def get(self, years, quarter):
+        """Rows of one period.
+
+        Returns a shallow copy, so callers may add derived columns without
+        touching the shared slice.
+        """
+        part = self.slices.get((int(years), int(quarter)))
+        if part is None:
+            return self._empty.copy()
+        return part.copy(deep=False)
+
+    def frame(self):
+        """All rows, in period order."""
+        if not self.slices:
+            return self._empty.copy()
+        return pd.concat(self.slices.values(), ignore_index=True)
+
+    def year(self, years):
+        """Rows of every quarter of one year."""
+        parts = [self.slices[(int(years), quarter)] for quarter in self.quarters.get(int(years), [])]
+        if not parts:
+            return self._empty.copy()
+        return pd.concat(parts, ignore_index=True)
@@ -0,0 +1,79 @@
+# Chart builders shared by the dashboard and the static pre-render
+# Plain Plotly figures with no Streamlit dependency, so the same charts can be
+# built in the app (Main_Streamlit.py) and in worker processes
+# (pulse_prerender.py).
+
+import plotly.express as px
+
+
+def choropleth_figure(df, value_col, geojson, color_scale="Viridis", value_suffix="", width=800):
+    """Standardized state choropleth.
+
+    geojson is the (simplified) state geometry with StateKey feature ids
+    (see pulse_dimensions.key_geometry); states are located by the frame's
+    StateKey column and labelled with its States column.
+    """
+    if df.empty:
+        return None
+
+    fig = px.choropleth(
+        df,
+        geojson=geojson,
+        locations='StateKey',
+        color=value_col,
+        color_continuous_scale=color_scale,
+        hover_name="States",
+        hover_data={"StateKey": False, value_col: ":,.1f"},
+        labels={value_col: value_suffix or value_col}
+    )
+
+    fig.update_geos(
+        fitbounds="locations",
+        visible=False,
+        projection_type='mercator',
+        projection_scale=1.2,
+        center={"lat": 22.5, "lon": 78.5}
+    )
+
+    fig.update_layout(
+        width=width,
+        height=650,
+        margin=dict(l=100, r=0, t=10, b=10),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        dragmode=False,
+        geo=dict(bgcolor='rgba(0,0,0,0)'),
+        coloraxis_showscale=False
+    )
+    return fig
+
+
+def create_pie_chart(df, values_col, names_col, title):
+    """Create a standardized pie chart."""
+    if df.empty:
+        return None
+    
+    fig = px.pie(df, values=values_col, names=names_col, title=title, hole=0.4)
+    fig.update_layout(height=400)
+    return fig
+
+
+def create_bar_chart(df, x_col, y_col, title, text_auto=True):
+    """Create a standardized bar chart."""
+    if df.empty:
+        return None
+    
+    fig = px.bar(df, x=x_col, y=y_col, title=title, text_auto=text_auto, color=x_col)
+    fig.update_layout(height=400, xaxis_title=x_col.replace('_', ' ').title(), 
+                     yaxis_title=y_col.replace('_', ' ').title())
+    return fig
+
+
+def create_line_chart(df, x_col, y_col, title, height=400, tickformat=".2e", **layout):
+    """Create a standardized line chart with markers."""
+    if df.empty:
+        return None
+
+    fig = px.line(df, x=x_col, y=y_col, title=title, markers=True)
+    fig.update_layout(height=height, yaxis=dict(tickformat=tickformat), **layout)
+    return fig
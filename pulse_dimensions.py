@@ -0,0 +1,154 @@
+# PhonePe Pulse state and district dimensions
+# Canonical state and district names with integer surrogate keys, built once
+# at ingest. Every Pulse state folder must match exactly one state of the map
+# GeoJSON or the ingest stops with the names that failed, instead of a map
+# silently losing states. Base tables store the canonical names plus
+# StateKey (and DistrictKey), so maps locate states by key and never rewrite
+# names at render time.
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from pulse_geo import NAME_PROPERTY, build_state_index, load_geojson, normalize_name
+from pulse_schema import DIMENSIONS, DISTRICT_DIM, STATE_DIM
+from pulse_store import STORE_DIR, has_table, read_table
+
+
+class DimensionError(ValueError):
+    """State names that do not match the map's states."""
+
+
+def normalize_district(name):
+    """Matching form of a district name: 'Bengaluru Urban District' -> 'bengaluru urban'."""
+    name = str(name).lower().replace("&", " and ").replace("-", " ")
+    name = " ".join(re.sub(r"[^a-z0-9 ]", "", name).split())
+    return name[:-len(" district")] if name.endswith(" district") else name
+
+
+class Dimensions:
+    """State and district dimension rows, and the lookups that key fact frames.
+
+    Built from the rows already stored, whose keys never change. add_states
+    registers the states of an ingest run; apply then keys each base table
+    frame, giving districts seen for the first time the next DistrictKey.
+    """
+
+    def __init__(self, states=None, districts=None):
+        # normalized name -> (StateKey, States)
+        self.states = {}
+        # (StateKey, normalized district) -> (DistrictKey, District)
+        self.districts = {}
+        if states is not None:
+            for key, name in zip(states["StateKey"], states["States"]):
+                self.states[normalize_name(name)] = (int(key), str(name))
+        if districts is not None:
+            for key, state_key, name in zip(districts["DistrictKey"], districts["StateKey"], districts["District"]):
+                self.districts[(int(state_key), normalize_district(name))] = (int(key), str(name))
+        self.next_district = max((key for key, _ in self.districts.values()), default=0) + 1
+
+    def add_states(self, names, geojson=None):
+        """Register the states behind raw names (Pulse folder names or titles).
+
+        Every name must match a GeoJSON state, and two names that differ after
+        normalization must not match the same one; DimensionError lists the
+        offenders. New states are keyed after the existing ones, by name.
+        """
+        state_index = build_state_index(geojson if geojson is not None else load_geojson())
+        unmatched, matches = [], {}
+        for name in sorted(set(names)):
+            normalized = normalize_name(name)
+            if normalized not in state_index:
+                unmatched.append(name)
+            else:
+                matches.setdefault(normalized, []).append(name)
+        by_state = {}
+        for normalized in matches:
+            by_state.setdefault(state_index[normalized]["properties"][NAME_PROPERTY], []).append(normalized)
+        clashes = {state: found for state, found in by_state.items() if len(found) > 1}
+        if unmatched or clashes:
+            problems = []
+            if unmatched:
+                problems.append(f"no map state for {unmatched}")
+            for state, found in clashes.items():
+                problems.append(f"{[matches[n][0] for n in found]} all match {state!r}")
+            raise DimensionError("; ".join(problems))
+
+        next_key = max((key for key, _ in self.states.values()), default=0) + 1
+        for state in sorted(by_state):
+            normalized = normalize_name(state)
+            if normalized not in self.states:
+                self.states[normalized] = (next_key, state)
+                next_key += 1
+
+    def _state(self, name):
+        found = self.states.get(normalize_name(name))
+        if found is None:
+            raise DimensionError(f"unknown state {name!r}; register it with add_states first")
+        return found
+
+    def state_name(self, name):
+        """Canonical name of a raw state name."""
+        return self._state(name)[1]
+
+    def _district(self, state_key, name):
+        key = (state_key, normalize_district(name))
+        if key not in self.districts:
+            self.districts[key] = (self.next_district, str(name))
+            self.next_district += 1
+        return self.districts[key]
+
+    def apply(self, df):
+        """A base table frame with canonical names and its surrogate keys.
+
+        States is replaced by the canonical name and StateKey added; frames
+        with a District column also get DistrictKey. Lookups run once per
+        distinct name, not per row.
+        """
+        states = pd.Index(pd.unique(df["States"]))
+        found = [self._state(name) for name in states]
+        codes = states.get_indexer(df["States"])
+        state_keys = np.array([key for key, _ in found], dtype="int64")[codes]
+        columns = {
+            "States": np.array([name for _, name in found], dtype=object)[codes],
+            "StateKey": state_keys,
+        }
+        if "District" in df.columns:
+            pairs = pd.MultiIndex.from_arrays([state_keys, df["District"]])
+            districts = pairs.unique()
+            found = [self._district(int(state_key), name) for state_key, name in districts]
+            codes = districts.get_indexer(pairs)
+            columns["District"] = np.array([name for _, name in found], dtype=object)[codes]
+            columns["DistrictKey"] = np.array([key for key, _ in found], dtype="int64")[codes]
+        return df.assign(**columns)
+
+    def frames(self):
+        """The dimension tables, ordered by key."""
+        states = sorted(self.states.values())
+        districts = sorted((key, state_key, name) for (state_key, _), (key, name) in self.districts.items())
+        return {
+            STATE_DIM: pd.DataFrame(states, columns=list(DIMENSIONS[STATE_DIM]["columns"])),
+            DISTRICT_DIM: pd.DataFrame(districts, columns=list(DIMENSIONS[DISTRICT_DIM]["columns"])),
+        }
+
+
+def load_dimensions(store_dir=STORE_DIR):
+    """Dimensions already in the Parquet store (empty before the first export)."""
+    frames = {name: read_table(name, store_dir=store_dir) for name in DIMENSIONS if has_table(name, store_dir)}
+    return Dimensions(frames.get(STATE_DIM), frames.get(DISTRICT_DIM))
+
+
+def key_geometry(geojson, states):
+    """Copy of the state geometry whose feature ids are the StateKeys of dim_state.
+
+    Maps pass StateKey as locations, so states are matched by key. Features
+    without a dimension row are left out.
+    """
+    keys = {normalize_name(name): int(key) for key, name in zip(states["StateKey"], states["States"])}
+    features = []
+    for feature in geojson["features"]:
+        key = keys.get(normalize_name(feature["properties"][NAME_PROPERTY]))
+        if key is not None:
+            features.append(dict(feature, id=key))
+    return dict(geojson, features=features)
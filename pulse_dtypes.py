@@ -0,0 +1,106 @@
+# Compact pandas dtypes for the Pulse tables
+# pd.read_sql returns object columns for names and int64/float64 for every
+# number. The declared dtypes below shrink the frames each dashboard worker
+# keeps in its caches.
+
+import argparse
+
+import pandas as pd
+
+from pulse_schema import ALL_TABLES
+
+# ========================
+# DECLARED DTYPES
+# ========================
+# Per-column overrides; everything else follows its MySQL type.
+COLUMN_DTYPES = {
+    "Years": "int16",
+    "Quarter": "int8",
+    "StateKey": "int16",
+}
+
+SQL_DTYPES = {
+    "INT": "int32",
+    "BIGINT": "int64",
+    "FLOAT": "float32",
+    "DOUBLE": "float64",
+}
+
+
+def table_dtypes(table_name):
+    """Declared pandas dtype of every column of a table."""
+    dtypes = {}
+    for name, sql_type in ALL_TABLES[table_name]["columns"].items():
+        if name in COLUMN_DTYPES:
+            dtypes[name] = COLUMN_DTYPES[name]
+        elif sql_type.startswith("VARCHAR"):
+            dtypes[name] = "category"
+        else:
+            dtypes[name] = SQL_DTYPES[sql_type]
+    return dtypes
+
+
+def compact_frame(df, table_name):
+    """Coerce a loaded frame to the declared dtypes.
+
+    Integer columns holding NULLs keep their float dtype, and columns the
+    frame does not have are ignored, so partial selects work too.
+    """
+    converted = {}
+    for name, dtype in table_dtypes(table_name).items():
+        if name not in df.columns:
+            continue
+        column = df[name]
+        if dtype.startswith("int") and column.isna().any():
+            continue
+        converted[name] = column.astype(dtype)
+    return df.assign(**converted)
+
+
+# ========================
+# MEMORY REPORT
+# ========================
+def memory_report(frames):
+    """Bytes per table before and after compact_frame.
+
+    frames maps table name -> DataFrame as loaded.
+    """
+    rows = []
+    for table_name, df in frames.items():
+        before = int(df.memory_usage(deep=True).sum())
+        after = int(compact_frame(df, table_name).memory_usage(deep=True).sum())
+        rows.append({
+            "table": table_name,
+            "rows": len(df),
+            "bytes_before": before,
+            "bytes_after": after,
+            "saved_pct": round(100 * (1 - after / before), 1) if before else 0.0,
+        })
+    report = pd.DataFrame(rows)
+    if not report.empty:
+        total = report[["rows", "bytes_before", "bytes_after"]].sum()
+        report.loc[len(report)] = {
+            "table": "TOTAL",
+            "rows": int(total["rows"]),
+            "bytes_before": int(total["bytes_before"]),
+            "bytes_after": int(total["bytes_after"]),
+            "saved_pct": round(100 * (1 - total["bytes_after"] / total["bytes_before"]), 1),
+        }
+    return report
+
+
+if __name__ == "__main__":
+    from pulse_store import STORE_DIR, has_table, read_table
+
+    parser = argparse.ArgumentParser(description="Memory footprint of the Pulse tables before/after compaction")
+    parser.add_argument("--store", default=STORE_DIR)
+    args = parser.parse_args()
+
+    # Read back as object/int64/float64, the way pd.read_sql returns them
+    frames = {}
+    for name in ALL_TABLES:
+        if has_table(name, args.store):
+            df = read_table(name, store_dir=args.store)
+            widened = {"i": "int64", "u": "int64", "f": "float64"}
+            frames[name] = df.astype({col: widened.get(df[col].dtype.kind, object) for col in df.columns})
+    print(memory_report(frames).to_string(index=False))
@@ -0,0 +1,85 @@
+# Embedded DuckDB backend
+# Serves the dashboard's SQL straight from the extracted files with no
+# database server: every table is a DuckDB view over its Parquet partitions
+# (or the exported CSV when a table has no Parquet copy), and the pulse_queries
+# statements run in DuckDB's vectorized engine.
+
+import glob
+import os
+import re
+
+import duckdb
+
+from pulse_schema import ALL_TABLES
+from pulse_store import STORE_DIR, has_table, table_dir
+
+# ========================
+# CONFIGURATION
+# ========================
+CSV_DIR = "exported_csv"
+
+
+# ========================
+# CONNECTION
+# ========================
+def _quote(path):
+    return "'" + path.replace("'", "''") + "'"
+
+
+def table_source(table_name, store_dir=STORE_DIR, csv_dir=CSV_DIR):
+    """DuckDB table function reading a table, or None if it was not exported."""
+    if has_table(table_name, store_dir):
+        files = os.path.join(table_dir(table_name, store_dir), "**", "*.parquet")
+        if glob.glob(files, recursive=True):
+            return f"read_parquet({_quote(files)}, hive_partitioning = true)"
+    csv = ALL_TABLES[table_name].get("csv")
+    if csv and os.path.exists(os.path.join(csv_dir, csv)):
+        return f"read_csv_auto({_quote(os.path.join(csv_dir, csv))}, header = true)"
+    return None
+
+
+def connect(store_dir=STORE_DIR, csv_dir=CSV_DIR, database=":memory:", threads=None):
+    """Open DuckDB with one view per exported table (base tables and rollups).
+
+    Views read the files at query time, so re-exporting the store is picked
+    up without reconnecting. Use connection.cursor() per thread.
+    """
+    connection = duckdb.connect(database)
+    if threads:
+        connection.execute(f"SET threads = {int(threads)}")
+    for table_name, definition in ALL_TABLES.items():
+        source = table_source(table_name, store_dir, csv_dir)
+        if source is None:
+            continue
+        # Column order and names as declared, whatever order the files use;
+        # files exported before a column was added just lack it
+        present = {row[0] for row in connection.execute(f"DESCRIBE SELECT * FROM {source}").fetchall()}
+        select = ", ".join(name for name in definition["columns"] if name in present)
+        connection.execute(f"CREATE OR REPLACE VIEW {table_name} AS SELECT {select} FROM {source}")
+    return connection
+
+
+def available_tables(connection):
+    """Names of the tables the connection has views for."""
+    rows = connection.execute("SELECT view_name FROM duckdb_views() WHERE NOT internal").fetchall()
+    return sorted(name for (name,) in rows)
+
+
+# ========================
+# QUERIES
+# ========================
+def duckdb_sql(sql):
+    """Turn a pulse_queries statement (%(name)s params) into DuckDB's $name form."""
+    return re.sub(r"%\((\w+)\)s", r"$\1", sql)
+
+
+def query_frame(connection, sql, params=None):
+    """Run a pulse_queries statement and return a DataFrame.
+
+    Runs on its own cursor, so one connection can serve several threads.
+    """
+    cursor = connection.cursor()
+    try:
+        return cursor.execute(duckdb_sql(sql), params or {}).df()
+    finally:
+        cursor.close()
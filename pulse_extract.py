@@ -0,0 +1,372 @@
+# PhonePe Pulse extraction engine
+# Walks the Pulse JSON tree (data/aggregated|map|top/...) and builds one
+# DataFrame per MySQL table. Work is fanned out per (table, state) across a
+# process pool and the column batches are merged at the end. Rows are keyed
+# with the state/district dimensions (pulse_dimensions) on the way out. For
+# full exports, stream_export writes the same tables batch by batch in
+# bounded memory.
+
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from pulse_dimensions import Dimensions, load_dimensions
+from pulse_rollups import RollupBuilder
+from pulse_schema import ALL_TABLES, source_columns, table_columns
+from pulse_store import STORE_DIR, TableWriter, write_table
+
+# ========================
+# CONFIGURATION
+# ========================
+DATA_ROOT = "data"
+CSV_DIR = "exported_csv"
+
+# Rows per chunk of the streaming export
+CHUNK_ROWS = 100_000
+
+
+# ========================
+# FILE PARSERS
+# ========================
+# Each parser takes a loaded JSON document and yields the non-key columns
+# of one row (everything after States, Years, Quarter).
+def parse_transaction_data(doc):
+    for i in doc["data"]["transactionData"]:
+        instrument = i["paymentInstruments"][0]
+        yield i["name"], instrument["count"], instrument["amount"]
+
+
+def parse_users_by_device(doc):
+    for i in doc["data"]["usersByDevice"] or []:
+        yield i["brand"], i["count"], i["percentage"]
+
+
+def parse_hover_data_list(doc):
+    for i in doc["data"]["hoverDataList"]:
+        yield i["name"], i["metric"][0]["count"], i["metric"][0]["amount"]
+
+
+def parse_hover_data(doc):
+    for district, values in doc["data"]["hoverData"].items():
+        yield district, values["registeredUsers"], values["appOpens"]
+
+
+def parse_top_metric(doc):
+    for level, key in (("District", "districts"), ("Pincode", "pincodes")):
+        for i in doc["data"][key] or []:
+            yield level, i["entityName"], i["metric"]["count"], i["metric"]["amount"]
+
+
+def parse_top_users(doc):
+    for level, key in (("District", "districts"), ("Pincode", "pincodes")):
+        for i in doc["data"][key] or []:
+            yield level, i["name"], i["registeredUsers"]
+
+
+# table name -> (path below the data root, parser, normalize state names)
+DATASETS = {
+    "aggregated_transaction": ("aggregated/transaction/country/india/state", parse_transaction_data, False),
+    "aggregated_insurance": ("aggregated/insurance/country/india/state", parse_transaction_data, False),
+    "aggregated_user": ("aggregated/user/country/india/state", parse_users_by_device, False),
+    "map_insurance": ("map/insurance/hover/country/india/state", parse_hover_data_list, True),
+    "map_transaction": ("map/transaction/hover/country/india/state", parse_hover_data_list, True),
+    "map_user": ("map/user/hover/country/india/state", parse_hover_data, True),
+    "top_insurance": ("top/insurance/country/india/state", parse_top_metric, True),
+    "top_transaction": ("top/transaction/country/india/state", parse_top_metric, True),
+    "top_user": ("top/user/country/india/state", parse_top_users, True),
+}
+
+
+def normalize_state(state):
+    """Turn a Pulse directory name like 'andaman-&-nicobar-islands' into a title."""
+    return state.replace("-", " ").replace("&", "and").title()
+
+
+def state_root(data_root, table_name):
+    """Directory holding the per-state folders of a table."""
+    return os.path.join(data_root, DATASETS[table_name][0])
+
+
+# ========================
+# EXTRACTION
+# ========================
+def extract_state(table_name, data_root, state, files=None):
+    """Parse the year/quarter files of one state into a dict of column lists.
+
+    files restricts parsing to a list of (year, file name) pairs; by default
+    every file under the state folder is parsed.
+    """
+    _, parser, normalize = DATASETS[table_name]
+    columns = source_columns(table_name)
+    batch = {name: [] for name in columns}
+    state_dir = os.path.join(state_root(data_root, table_name), state)
+    state_value = normalize_state(state) if normalize else state
+
+    if files is None:
+        files = [
+            (year, file)
+            for year in sorted(os.listdir(state_dir))
+            for file in sorted(os.listdir(os.path.join(state_dir, year)))
+        ]
+
+    for year, file in files:
+        with open(os.path.join(state_dir, year, file), "r") as f:
+            doc = json.load(f)
+        quarter = int(os.path.splitext(file)[0])
+        for row in parser(doc):
+            batch["States"].append(state_value)
+            batch["Years"].append(int(year))
+            batch["Quarter"].append(quarter)
+            for name, value in zip(columns[3:], row):
+                batch[name].append(value)
+    return batch
+
+
+def _extract_task(task):
+    table_name, data_root, state, files = task
+    return table_name, extract_state(table_name, data_root, state, files)
+
+
+def list_states(data_root, tables=None):
+    """Names of the state folders of the given tables."""
+    return sorted({state for table_name in tables or DATASETS for state in os.listdir(state_root(data_root, table_name))})
+
+
+def register_states(data_root, tables=None, dims=None):
+    """Dimensions with every state folder of the tables registered (see Dimensions.add_states)."""
+    dims = dims if dims is not None else Dimensions()
+    dims.add_states(list_states(data_root, tables))
+    return dims
+
+
+def key_frames(frames, dims):
+    """Key extracted frames with the dimensions and add the dimension tables."""
+    frames = {table_name: dims.apply(df) for table_name, df in frames.items()}
+    frames.update(dims.frames())
+    return frames
+
+
+def list_tasks(data_root, tables=None):
+    """One (table, data_root, state, files) task per state folder of each table."""
+    tasks = []
+    for table_name in tables or DATASETS:
+        for state in sorted(os.listdir(state_root(data_root, table_name))):
+            tasks.append((table_name, data_root, state, None))
+    return tasks
+
+
+def merge_batches(results, tables):
+    """Concatenate per-state column batches into one DataFrame per table."""
+    merged = {table_name: {name: [] for name in source_columns(table_name)} for table_name in tables}
+    for table_name, batch in results:
+        for name, values in batch.items():
+            merged[table_name][name].extend(values)
+    return {table_name: pd.DataFrame(columns) for table_name, columns in merged.items()}
+
+
+def run_tasks(tasks, tables, workers=None, parallel=True):
+    """Run extraction tasks, in a process pool by default, and merge the results."""
+    if parallel and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_extract_task, tasks, chunksize=4))
+    else:
+        results = [_extract_task(task) for task in tasks]
+    return merge_batches(results, tables)
+
+
+def extract_all(data_root=DATA_ROOT, tables=None, workers=None, parallel=True, dims=None):
+    """Extract every table from the Pulse tree, in parallel by default.
+
+    The frames are keyed with dims (new Dimensions by default) and the
+    dimension tables are returned alongside them.
+    """
+    tables = list(tables or DATASETS)
+    dims = register_states(data_root, tables, dims)
+    return key_frames(run_tasks(list_tasks(data_root, tables), tables, workers, parallel), dims)
+
+
+def extract_files(data_root, changes, workers=None, parallel=True, dims=None):
+    """Extract only the given files.
+
+    changes maps table name -> {state: [(year, file name), ...]}. Pass the
+    dimensions already loaded as dims so existing keys are reused; the
+    returned dimension tables include them.
+    """
+    dims = dims if dims is not None else Dimensions()
+    dims.add_states({state for states in changes.values() for state in states})
+    tasks = [
+        (table_name, data_root, state, files)
+        for table_name, states in changes.items()
+        for state, files in sorted(states.items())
+    ]
+    return key_frames(run_tasks(tasks, list(changes), workers, parallel), dims)
+
+
+def export_csv(frames, csv_dir=CSV_DIR):
+    """Write extracted frames to the CSV files the loader expects."""
+    os.makedirs(csv_dir, exist_ok=True)
+    for table_name, df in frames.items():
+        df.to_csv(os.path.join(csv_dir, ALL_TABLES[table_name]["csv"]), index=False)
+
+
+# ========================
+# STREAMING EXPORT
+# ========================
+def list_year_tasks(data_root, table_name):
+    """One task per (state, year) folder of a table, so a batch never spans the tree."""
+    root = state_root(data_root, table_name)
+    for state in sorted(os.listdir(root)):
+        for year in sorted(os.listdir(os.path.join(root, state))):
+            files = [(year, file) for file in sorted(os.listdir(os.path.join(root, state, year)))]
+            yield table_name, data_root, state, files
+
+
+def _ordered_map(func, tasks, workers=None, parallel=True):
+    """Lazy, ordered executor.map keeping at most 2 tasks per worker in flight."""
+    if not parallel:
+        for task in tasks:
+            yield func(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        limit = 2 * (workers or os.cpu_count() or 1)
+        for task in tasks:
+            in_flight.append(executor.submit(func, task))
+            if len(in_flight) >= limit:
+                yield in_flight.popleft().result()
+        while in_flight:
+            yield in_flight.popleft().result()
+
+
+def iter_chunks(table_name, data_root=DATA_ROOT, workers=None, parallel=True, chunk_rows=CHUNK_ROWS,
+                dims=None):
+    """Yield a table as DataFrames of about chunk_rows rows, keyed with dims.
+
+    (state, year) batches are appended to one set of column lists until a
+    chunk is full, so at most one chunk (plus the batches in flight) is held
+    in memory, and DataFrames are only built per chunk.
+    """
+    if dims is None:
+        dims = register_states(data_root, [table_name])
+    columns = source_columns(table_name)
+    chunk = {name: [] for name in columns}
+    for _, batch in _ordered_map(_extract_task, list_year_tasks(data_root, table_name), workers, parallel):
+        for name in columns:
+            chunk[name].extend(batch[name])
+        if len(chunk["States"]) >= chunk_rows:
+            yield dims.apply(pd.DataFrame(chunk, columns=columns))
+            chunk = {name: [] for name in columns}
+    if chunk["States"]:
+        yield dims.apply(pd.DataFrame(chunk, columns=columns))
+
+
+class CsvWriter:
+    """Append DataFrame chunks to a table's CSV."""
+
+    def __init__(self, table_name, csv_dir=CSV_DIR):
+        os.makedirs(csv_dir, exist_ok=True)
+        self.path = os.path.join(csv_dir, ALL_TABLES[table_name]["csv"])
+        self.columns = table_columns(table_name)
+        self.rows = 0
+        # Header only, so an empty table still has a well-formed file
+        pd.DataFrame(columns=self.columns).to_csv(self.path, index=False)
+
+    def write(self, df):
+        self.rows += len(df)
+        df[self.columns].to_csv(self.path, mode="a", header=False, index=False)
+
+    def close(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def stream_export(data_root=DATA_ROOT, out=None, fmt="parquet", tables=None, workers=None,
+                  parallel=True, chunk_rows=CHUNK_ROWS, dims=None):
+    """Extract the tree straight to Parquet (with rollups) or CSV in bounded memory.
+
+    Tables are written one at a time in chunks of about chunk_rows rows,
+    and the rollups are accumulated from the same chunks, so peak memory
+    does not grow with the number of quarters or districts. The dimension
+    tables are written last; a Parquet store keeps the keys it already has,
+    and dims (e.g. that store's, for a CSV copy) overrides them. Returns
+    rows written per table.
+    """
+    rows = {}
+    rollups = RollupBuilder() if fmt == "parquet" else None
+    if dims is None:
+        dims = load_dimensions(out or STORE_DIR) if fmt == "parquet" else Dimensions()
+    register_states(data_root, tables, dims)
+    for table_name in tables or DATASETS:
+        if fmt == "parquet":
+            writer = TableWriter(table_name, out or STORE_DIR)
+        else:
+            writer = CsvWriter(table_name, out or CSV_DIR)
+        with writer:
+            for df in iter_chunks(table_name, data_root, workers, parallel, chunk_rows, dims):
+                writer.write(df)
+                if rollups is not None:
+                    rollups.add(table_name, df)
+        rows[table_name] = writer.rows
+    for dim_name, df in dims.frames().items():
+        if fmt == "parquet":
+            write_table(df, dim_name, out or STORE_DIR)
+        else:
+            with CsvWriter(dim_name, out or CSV_DIR) as writer:
+                writer.write(df)
+        rows[dim_name] = len(df)
+    if rollups is not None:
+        for rollup_name, df in rollups.frames().items():
+            write_table(df, rollup_name, out or STORE_DIR)
+    return rows
+
+
+# ========================
+# TIMING
+# ========================
+def compare_serial_parallel(data_root=DATA_ROOT, tables=None, workers=None):
+    """Time serial and parallel extraction on the same tree and check they match."""
+    start = time.perf_counter()
+    serial = extract_all(data_root, tables, parallel=False)
+    serial_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel = extract_all(data_root, tables, workers=workers, parallel=True)
+    parallel_seconds = time.perf_counter() - start
+
+    for table_name, df in serial.items():
+        pd.testing.assert_frame_equal(df, parallel[table_name])
+
+    rows = sum(len(df) for df in serial.values())
+    print(f"rows extracted : {rows:,}")
+    print(f"serial         : {serial_seconds:.2f}s")
+    print(f"parallel       : {parallel_seconds:.2f}s ({workers or os.cpu_count()} workers)")
+    print(f"speedup        : {serial_seconds / parallel_seconds:.2f}x")
+    return {"rows": rows, "serial_seconds": serial_seconds, "parallel_seconds": parallel_seconds}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Extract the PhonePe Pulse JSON tree")
+    parser.add_argument("data_root", nargs="?", default=DATA_ROOT)
+    parser.add_argument("--format", choices=("parquet", "csv"), default="parquet")
+    parser.add_argument("--out", default=None, help="output directory (default depends on --format)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS, help="rows buffered per write")
+    parser.add_argument("--compare", action="store_true", help="time serial vs parallel extraction")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_serial_parallel(args.data_root, workers=args.workers)
+    else:
+        rows = stream_export(args.data_root, args.out, args.format, workers=args.workers,
+                             chunk_rows=args.chunk_rows)
+        print(f"rows exported  : {sum(rows.values()):,} ({args.format})")
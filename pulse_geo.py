@@ -0,0 +1,232 @@
+# India state geometry for the dashboard choropleths
+# The GeoJSON is downloaded once into assets/ and read from disk afterwards,
+# so reruns never touch the network. Simplified copies at a few tolerance
+# levels are precomputed next to it, and each map embeds the lightest level
+# that still looks right at its rendered width.
+
+import argparse
+import json
+import os
+import re
+
+import numpy as np
+
+# ========================
+# CONFIGURATION
+# ========================
+GEOJSON_URL = "https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson"
+GEOJSON_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "india_states.geojson")
+NAME_PROPERTY = "ST_NM"
+
+# Simplification levels: name -> (Douglas-Peucker tolerance in degrees,
+# decimals kept per coordinate). "full" is the downloaded file as is.
+GEOMETRY_LEVELS = {
+    "full": (0.0, None),
+    "high": (0.004, 4),
+    "medium": (0.012, 3),
+    "low": (0.03, 2),
+}
+# Longitude span drawn by the maps, used to convert map width to degrees/pixel
+MAP_SPAN_DEGREES = 30.0
+
+# Normalized Pulse names that differ from the GeoJSON ones
+NAME_ALIASES = {
+    "andaman and nicobar islands": "andaman and nicobar",
+}
+
+
+# ========================
+# GEOJSON FILE
+# ========================
+def ensure_geojson(path=GEOJSON_PATH, url=GEOJSON_URL):
+    """Download the GeoJSON to path unless it is already on disk."""
+    if os.path.exists(path):
+        return path
+    import requests
+
+    response = requests.get(url, timeout=30)
+    response.raise_for_status()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(response.content)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_geojson(path=GEOJSON_PATH):
+    """Read the state GeoJSON from disk, fetching it the first time only."""
+    with open(ensure_geojson(path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def level_path(level, path=GEOJSON_PATH):
+    """File of a simplification level: india_states.geojson -> india_states.<level>.geojson."""
+    if level == "full":
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{level}{ext}"
+
+
+def load_geometry(level="full", path=GEOJSON_PATH):
+    """Read one simplification level, building the level files if missing."""
+    if not os.path.exists(level_path(level, path)):
+        build_geometry_levels(path, levels=[level])
+    return load_geojson(level_path(level, path))
+
+
+# ========================
+# SIMPLIFICATION
+# ========================
+def simplify_ring(ring, tolerance):
+    """Douglas-Peucker simplification of one (closed) coordinate ring."""
+    points = np.asarray(ring, dtype=float)[:, :2]
+    if tolerance <= 0 or len(points) <= 4:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end <= start + 1:
+            continue
+        a, b = points[start], points[end]
+        inner = points[start + 1:end]
+        dx, dy = b - a
+        length = np.hypot(dx, dy)
+        if length == 0:
+            # Closed ring: distance from the start point
+            distances = np.hypot(inner[:, 0] - a[0], inner[:, 1] - a[1])
+        else:
+            distances = np.abs(dx * (inner[:, 1] - a[1]) - dy * (inner[:, 0] - a[0])) / length
+        farthest = int(distances.argmax())
+        if distances[farthest] > tolerance:
+            index = start + 1 + farthest
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return points[keep]
+
+
+def _coordinates(points, decimals):
+    return (np.round(points, decimals) if decimals is not None else points).tolist()
+
+
+def _simplify_polygon(rings, tolerance, decimals):
+    """Simplified rings of a polygon; None when its outer ring collapses."""
+    simplified = []
+    for position, ring in enumerate(rings):
+        points = simplify_ring(ring, tolerance)
+        if len(points) < 4:
+            if position == 0:
+                return None
+            continue  # drop collapsed holes
+        simplified.append(_coordinates(points, decimals))
+    return simplified
+
+
+def simplify_geometry(geometry, tolerance, decimals):
+    """Simplify a Polygon/MultiPolygon.
+
+    Polygons that collapse below a ring (small islands) are dropped, but a
+    state always keeps at least its largest polygon.
+    """
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        return geometry
+
+    kept = [p for p in (_simplify_polygon(rings, tolerance, decimals) for rings in polygons) if p]
+    if not kept:
+        largest = max(polygons, key=lambda rings: len(rings[0]))
+        kept = [[_coordinates(np.asarray(largest[0], dtype=float)[:, :2], decimals)]]
+    if len(kept) == 1:
+        return {"type": "Polygon", "coordinates": kept[0]}
+    return {"type": "MultiPolygon", "coordinates": kept}
+
+
+def simplify_geojson(geojson, tolerance, decimals=None):
+    """Copy of a FeatureCollection with simplified geometry (properties kept)."""
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "properties": feature["properties"],
+                "geometry": simplify_geometry(feature["geometry"], tolerance, decimals),
+            }
+            for feature in geojson["features"]
+        ],
+    }
+
+
+def count_vertices(geojson):
+    """Total number of coordinate pairs in a FeatureCollection."""
+    total = 0
+    for feature in geojson["features"]:
+        geometry = feature["geometry"]
+        polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+        total += sum(len(ring) for rings in polygons for ring in rings)
+    return total
+
+
+def build_geometry_levels(path=GEOJSON_PATH, levels=None):
+    """Precompute the simplified level files next to the full GeoJSON.
+
+    Returns one row per level with its tolerance, vertex count and size.
+    """
+    geojson = load_geojson(path)
+    report = []
+    for level in levels or GEOMETRY_LEVELS:
+        tolerance, decimals = GEOMETRY_LEVELS[level]
+        if level != "full":
+            simplified = simplify_geojson(geojson, tolerance, decimals)
+            tmp_path = f"{level_path(level, path)}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(simplified, f, separators=(",", ":"))
+            os.replace(tmp_path, level_path(level, path))
+        else:
+            simplified = geojson
+        report.append({
+            "level": level,
+            "tolerance": tolerance,
+            "decimals": decimals,
+            "vertices": count_vertices(simplified),
+            "bytes": os.path.getsize(level_path(level, path)),
+        })
+    return report
+
+
+def pick_level(width_px):
+    """Lightest level whose tolerance stays under half a pixel at width_px."""
+    half_pixel = MAP_SPAN_DEGREES / max(int(width_px), 1) / 2
+    adequate = [level for level, (tolerance, _) in GEOMETRY_LEVELS.items() if tolerance <= half_pixel]
+    return max(adequate, key=lambda level: GEOMETRY_LEVELS[level][0])
+
+
+# ========================
+# STATE NAME INDEX
+# ========================
+def normalize_name(name):
+    """Canonical form of a state name: 'Andaman-&-Nicobar' -> 'andaman and nicobar'."""
+    name = str(name).lower().replace("&", " and ").replace("-", " ")
+    name = re.sub(r"[^a-z0-9 ]", "", name)
+    name = " ".join(name.split())
+    return NAME_ALIASES.get(name, name)
+
+
+def build_state_index(geojson):
+    """Map normalized state name -> GeoJSON feature."""
+    return {normalize_name(f["properties"][NAME_PROPERTY]): f for f in geojson["features"]}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute simplified state geometry levels")
+    parser.add_argument("--geojson", default=GEOJSON_PATH)
+    args = parser.parse_args()
+
+    for row in build_geometry_levels(args.geojson):
+        print(f"{row['level']:<8} tolerance {row['tolerance']:<6} {row['vertices']:>9,} vertices  "
+              f"{row['bytes']:>11,} bytes")
@@ -0,0 +1,130 @@
+# Lightweight performance metrics for dashboard reruns
+# Timing spans and cache hit/miss counters collected per Streamlit rerun,
+# logged as one JSON line per rerun and shown in an optional debug panel.
+# A span is two perf_counter() calls and a list append, so it stays on in
+# production.
+
+import contextvars
+import json
+import logging
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# ========================
+# CONFIGURATION
+# ========================
+METRICS_ENABLED = os.environ.get("PHONEPE_METRICS", "1") != "0"
+LOGGER_NAME = "phonepe.metrics"
+
+_current_run = contextvars.ContextVar("phonepe_metrics_run", default=None)
+
+
+# ========================
+# RUN METRICS
+# ========================
+class RunMetrics:
+    """Spans and cache counters of one rerun."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self.caches = {}
+        self._open = []
+
+    def record(self, name, ms, meta):
+        self.spans.append({"name": name, "ms": round(ms, 3), **meta})
+
+    def count(self, cache, hit):
+        counters = self.caches.setdefault(cache, {"hits": 0, "misses": 0})
+        counters["hits" if hit else "misses"] += 1
+
+    def totals(self):
+        """Per span name: calls, total and max milliseconds, slowest first."""
+        totals = {}
+        for s in self.spans:
+            row = totals.setdefault(s["name"], {"span": s["name"], "calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+            row["calls"] += 1
+            row["total_ms"] = round(row["total_ms"] + s["ms"], 3)
+            row["max_ms"] = max(row["max_ms"], s["ms"])
+        return sorted(totals.values(), key=lambda row: row["total_ms"], reverse=True)
+
+    def summary(self):
+        return {
+            "event": "rerun",
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "spans": self.spans,
+            "caches": self.caches,
+        }
+
+
+def start_run():
+    """Begin collecting metrics for the current rerun (thread/context local)."""
+    run = RunMetrics() if METRICS_ENABLED else None
+    _current_run.set(run)
+    return run
+
+
+def current_run():
+    return _current_run.get()
+
+
+# ========================
+# SPANS
+# ========================
+@contextmanager
+def span(name, cache=None, **meta):
+    """Time a block; with cache=..., also count it as a hit or a miss.
+
+    The block is a hit unless cache_miss() is called inside it, which the
+    cached functions do from their bodies (only executed on a miss).
+    """
+    run = _current_run.get()
+    if run is None:
+        yield
+        return
+    frame = {"miss": False}
+    run._open.append(frame)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        ms = (time.perf_counter() - start) * 1000
+        run._open.pop()
+        if cache is not None:
+            meta["cache"] = cache
+            meta["hit"] = not frame["miss"]
+            run.count(cache, not frame["miss"])
+        run.record(name, ms, meta)
+
+
+def cache_miss():
+    """Mark the innermost open span as a cache miss."""
+    run = _current_run.get()
+    if run is not None and run._open:
+        run._open[-1]["miss"] = True
+
+
+# ========================
+# LOGGING
+# ========================
+def get_logger():
+    """JSON-lines logger on stderr, unless the host app configured one."""
+    logger = logging.getLogger(LOGGER_NAME)
+    if not logger.handlers:
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
+
+
+def emit_run(run, **fields):
+    """Log the rerun summary as one JSON line; returns the summary."""
+    if run is None:
+        return None
+    summary = {**run.summary(), **fields}
+    get_logger().info(json.dumps(summary, default=str))
+    return summary
@@ -0,0 +1,69 @@
+# Concurrent table loading
+# Runs a set of independent loaders on a bounded thread pool so a cold page
+# waits about as long as its slowest table instead of the sum of all of them.
+# Each loader gets its own timeout, and a failing or slow table is reported
+# without holding up the others.
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# ========================
+# CONFIGURATION
+# ========================
+MAX_WORKERS = int(os.environ.get("PHONEPE_LOAD_WORKERS", "4"))
+TABLE_TIMEOUT = float(os.environ.get("PHONEPE_LOAD_TIMEOUT", "30"))
+
+
+class LoadTimeout(Exception):
+    """A loader ran longer than its timeout."""
+
+
+def fetch_all(tasks, max_workers=MAX_WORKERS, timeout=TABLE_TIMEOUT, initializer=None):
+    """Run loaders concurrently and collect what finished.
+
+    tasks maps name -> zero-argument callable. Returns (results, errors):
+    results maps name -> return value, errors maps name -> exception
+    (LoadTimeout for loaders still running timeout seconds after they
+    started; time spent queued for a worker does not count). A timed-out
+    loader cannot be interrupted and finishes in the background; queued
+    loaders are cancelled once everything else is done. initializer, if
+    given, is called in the worker thread before each loader.
+    """
+    results, errors = {}, {}
+    if not tasks:
+        return results, errors
+
+    started = {}
+
+    def run(name, loader):
+        started[name] = time.monotonic()
+        if initializer is not None:
+            initializer()
+        return loader()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))),
+                                  thread_name_prefix="phonepe-load")
+    futures = {executor.submit(run, name, loader): name for name, loader in tasks.items()}
+    pending = set(futures)
+    try:
+        while pending:
+            # Sleep until something finishes or the earliest running loader times out
+            running = [started[futures[f]] for f in pending if futures[f] in started]
+            wait_for = min(running) + timeout - time.monotonic() if running else timeout
+            done, pending = wait(pending, timeout=max(wait_for, 0), return_when=FIRST_COMPLETED)
+            for future in done:
+                name = futures[future]
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    errors[name] = e
+            now = time.monotonic()
+            for future in list(pending):
+                name = futures[future]
+                if name in started and now - started[name] >= timeout:
+                    errors[name] = LoadTimeout(f"{name} did not load within {timeout:g}s")
+                    pending.discard(future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results, errors
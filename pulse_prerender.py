@@ -0,0 +1,325 @@
+# Static pre-render of the case-study views
+# Renders every (case study, year, quarter) view of the dashboard to a static
+# HTML page from the Parquet store, so reports and mirrors need no Streamlit
+# or MySQL. Figures come from the pulse_charts builders the app uses and are
+# built in a process pool. Every page loads one shared plotly.js and one
+# shared geometry script, and a view is only re-rendered when the hash of its
+# input data changed since the last run.
+#
+#   python pulse_prerender.py --store exported_parquet --out static_site
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly
+from plotly.offline import get_plotlyjs
+
+from period_index import PeriodIndex
+from pulse_charts import choropleth_figure, create_bar_chart, create_line_chart, create_pie_chart
+from pulse_dimensions import key_geometry
+from pulse_geo import load_geometry, pick_level
+from pulse_queries import aggregate_frame
+from pulse_schema import LEADERBOARD_TABLE, STATE_DIM
+from pulse_store import STORE_DIR, has_table, read_table
+from pulse_timeseries import build_time_series, growth_leaders
+
+# ========================
+# CONFIGURATION
+# ========================
+OUT_DIR = "static_site"
+MANIFEST = "render_manifest.json"
+# Bump when the page template or the chart builders change, to re-render every view
+RENDER_VERSION = 1
+# Every map shares the geometry level of the widest map the app draws
+MAP_WIDTH = 1300
+# Choropleths are built against this stub; pages swap in the shared geometry
+GEOMETRY_STUB = {"type": "FeatureCollection", "features": []}
+
+
+# ========================
+# STORE DATA
+# ========================
+class StoreData:
+    """Store tables the views read, each loaded once per run."""
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        self.cache = {}
+
+    def index(self, table_name):
+        key = ("index", table_name)
+        if key not in self.cache:
+            self.cache[key] = PeriodIndex(read_table(table_name, store_dir=self.store_dir))
+        return self.cache[key]
+
+    def series(self, table_name, measures, by=()):
+        key = ("series", table_name, tuple(measures), tuple(by))
+        if key not in self.cache:
+            df = read_table(table_name, store_dir=self.store_dir)
+            self.cache[key] = PeriodIndex(build_time_series(df, measures, by))
+        return self.cache[key]
+
+    def top_districts(self, years, quarter, n=10):
+        """Top districts by app opens, from the leaderboard when the store has one."""
+        if "leaderboard" not in self.cache:
+            self.cache["leaderboard"] = (
+                read_table(LEADERBOARD_TABLE, store_dir=self.store_dir)
+                if has_table(LEADERBOARD_TABLE, self.store_dir) else None
+            )
+        boards = self.cache["leaderboard"]
+        if boards is not None:
+            rows = boards[(boards["Board"] == "districts_by_app_opens") & (boards["Years"] == years)
+                          & (boards["Quarter"] == quarter)]
+            if len(rows) >= n:
+                rows = rows.sort_values("Position").head(n)
+                return pd.DataFrame({"District": rows["Name"].to_numpy(), "AppOpens": rows["Value"].to_numpy()})
+        df = read_table("map_user", columns=["District", "AppOpens"], years=years, quarter=quarter,
+                        store_dir=self.store_dir)
+        return aggregate_frame(df, ["AppOpens"], ["District"], order_by="AppOpens", limit=n)
+
+
+# ========================
+# VIEWS
+# ========================
+# Each view returns its charts as (heading, builder, frame, args, kwargs),
+# with the same inputs the dashboard page passes to the builder.
+def transaction_charts(data, years, quarter):
+    states = data.index("rollup_transaction_state").get(years, quarter)
+    top = states.nlargest(10, "Transaction_amount")
+    types = data.index("rollup_transaction_type").get(years, quarter).nlargest(5, "Transaction_count")
+    return [
+        ("State-wise Transaction Heatmap", "choropleth",
+         states.assign(Amount_M=states["Transaction_amount"] / 1e6)[["StateKey", "States", "Amount_M"]],
+         ("Amount_M",), {"color_scale": "Blues", "value_suffix": "₹M"}),
+        ("Top 10 States", "bar", top.assign(Amount_B=top["Transaction_amount"] / 1e9)[["States", "Amount_B"]],
+         ("States", "Amount_B", "Top States (₹B)"), {}),
+        ("Payment Method Distribution", "pie", types[["Transaction_type", "Transaction_count"]],
+         ("Transaction_count", "Transaction_type", "Payment Types"), {}),
+    ]
+
+
+def device_charts(data, years, quarter):
+    brands = data.index("rollup_brand").get(years, quarter).nlargest(8, "Transaction_count")
+    return [
+        ("Device Brand Distribution", "pie", brands[["Brands", "Transaction_count"]],
+         ("Transaction_count", "Brands", "Device Brands"), {}),
+        ("Top Districts by App Opens", "bar", data.top_districts(years, quarter),
+         ("District", "AppOpens", "App Opens by District"), {}),
+    ]
+
+
+def insurance_charts(data, years, quarter):
+    states = data.index("rollup_insurance_state").get(years, quarter)
+    trend = data.series("rollup_insurance_period", ["Insurance_amount"]).year(years)
+    return [
+        ("Insurance Coverage Heatmap", "choropleth",
+         states.assign(Amount_K=states["Insurance_amount"] / 1e3)[["StateKey", "States", "Amount_K"]],
+         ("Amount_K",), {"color_scale": "Oranges", "value_suffix": "₹K"}),
+        ("Quarterly Growth Trend", "line", trend[["Quarter", "Insurance_amount"]],
+         ("Quarter", "Insurance_amount", "Insurance Growth"), {}),
+    ]
+
+
+def expansion_charts(data, years, quarter):
+    states = data.index("rollup_map_transaction_state").get(years, quarter)
+    series = data.series("rollup_map_transaction_state", ["Transaction_amount"], ["States"])
+    top_growth, (growth_years, growth_quarter) = growth_leaders(series, years, quarter, "Transaction_amount")
+    growth_heading = "Growth Potential Analysis"
+    if not top_growth.empty and (growth_years, growth_quarter) != (years, quarter):
+        growth_heading += f" ({growth_years} Q{growth_quarter}, the first quarter with growth figures)"
+    return [
+        ("Market Penetration Heatmap", "choropleth",
+         states.assign(Amount_M=states["Transaction_amount"] / 1e6)[["StateKey", "States", "Amount_M"]],
+         ("Amount_M",), {"color_scale": "Reds", "value_suffix": "₹M"}),
+        (growth_heading, "bar", top_growth[["States", "Growth_Score"]],
+         ("States", "Growth_Score", "Growth Potential by State"), {}),
+    ]
+
+
+def user_charts(data, years, quarter):
+    users = data.index("rollup_map_user_state").get(years, quarter)
+    users = users.assign(
+        Users_K=users["RegisteredUsers"] / 1e3,
+        Engagement_Rate=(users["AppOpens"] / users["RegisteredUsers"]).fillna(0),
+    )
+    return [
+        ("User Distribution Heatmap", "choropleth", users[["StateKey", "States", "Users_K"]],
+         ("Users_K",), {"color_scale": "Purples", "value_suffix": "K Users"}),
+        ("User Engagement Analysis", "bar", users.nlargest(10, "Engagement_Rate")[["States", "Engagement_Rate"]],
+         ("States", "Engagement_Rate", "User Engagement by State"), {}),
+    ]
+
+
+# slug -> (title, table whose periods are rendered, charts)
+CASE_STUDIES = {
+    "transaction": ("Transaction Dynamics Analysis", "rollup_transaction_state", transaction_charts),
+    "device": ("Device Usage & User Engagement", "rollup_brand", device_charts),
+    "insurance": ("Insurance Market Analysis", "rollup_insurance_state", insurance_charts),
+    "expansion": ("Market Expansion Strategy", "rollup_map_transaction_state", expansion_charts),
+    "users": ("User Growth Analysis", "rollup_map_user_state", user_charts),
+}
+
+
+def view_hash(charts):
+    """Digest of everything a view's page is built from."""
+    digest = hashlib.sha256(str(RENDER_VERSION).encode())
+    for heading, kind, df, args, kwargs in charts:
+        digest.update(repr((heading, kind, args, sorted(kwargs.items()), list(df.columns))).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# ========================
+# RENDERING (WORKERS)
+# ========================
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<script src="../plotly.min.js"></script>
+<script src="../geometry.js"></script>
+<style>body {{ font-family: sans-serif; margin: 2rem; }} .chart {{ margin-bottom: 2rem; }}</style>
+</head>
+<body>
+<p><a href="../index.html">All views</a></p>
+<h1>{title}</h1>
+{body}
+<script>
+function draw(id, fig) {{
+  fig.data.forEach(function (trace) {{
+    if (trace.type === "choropleth") {{ trace.geojson = window.PULSE_GEOMETRY; }}
+  }});
+  Plotly.newPlot(id, fig.data, fig.layout, {{displayModeBar: false, responsive: true}});
+}}
+{scripts}
+</script>
+</body>
+</html>
+"""
+
+
+def build_chart(kind, df, args, kwargs):
+    if kind == "choropleth":
+        return choropleth_figure(df, *args, GEOMETRY_STUB, width=MAP_WIDTH, **kwargs)
+    builders = {"bar": create_bar_chart, "pie": create_pie_chart, "line": create_line_chart}
+    return builders[kind](df, *args, **kwargs)
+
+
+def _write(path, text):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def render_view(task):
+    """Build one view's figures and write its page; runs in a worker process."""
+    path, title, charts = task
+    body, scripts = [], []
+    for i, (heading, kind, df, args, kwargs) in enumerate(charts):
+        body.append(f"<h3>{html.escape(heading)}</h3>")
+        fig = build_chart(kind, df, args, kwargs)
+        if fig is None:
+            body.append("<p>No data available for the chart.</p>")
+            continue
+        body.append(f'<div id="chart-{i}" class="chart"></div>')
+        # Keep "</script>" in the data from closing the inline script
+        figure = fig.to_json().replace("</", "<\\/")
+        scripts.append(f'draw("chart-{i}", {figure});')
+    _write(path, PAGE.format(title=html.escape(title), body="\n".join(body), scripts="\n".join(scripts)))
+    return path
+
+
+# ========================
+# SITE
+# ========================
+def _load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def write_shared_assets(out_dir, store_dir=STORE_DIR):
+    """plotly.js and the map geometry (keyed by StateKey), written once and shared by every page."""
+    plotly_js = os.path.join(out_dir, "plotly.min.js")
+    version_file = os.path.join(out_dir, "plotly.version")
+    current = open(version_file).read() if os.path.exists(version_file) else None
+    if current != plotly.__version__ or not os.path.exists(plotly_js):
+        _write(plotly_js, get_plotlyjs())
+        _write(version_file, plotly.__version__)
+    geometry = key_geometry(load_geometry(pick_level(MAP_WIDTH)), read_table(STATE_DIM, store_dir=store_dir))
+    geometry = "window.PULSE_GEOMETRY = " + json.dumps(geometry, separators=(",", ":")) + ";\n"
+    geometry_path = os.path.join(out_dir, "geometry.js")
+    if not os.path.exists(geometry_path) or open(geometry_path, encoding="utf-8").read() != geometry:
+        _write(geometry_path, geometry)
+
+
+def write_index(out_dir, views):
+    """Landing page linking every rendered view."""
+    sections = []
+    for slug, (title, _, _) in CASE_STUDIES.items():
+        links = " ".join(
+            f'<a href="{path}">{years} Q{quarter}</a>' for view_slug, years, quarter, path in views if view_slug == slug
+        )
+        sections.append(f"<h2>{html.escape(title)}</h2>\n<p>{links or 'No data'}</p>")
+    page = ("<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>PhonePe Pulse views</title>\n"
+            "<style>body { font-family: sans-serif; margin: 2rem; } a { margin-right: 0.6rem; }</style>\n"
+            "</head>\n<body>\n<h1>PhonePe Pulse views</h1>\n" + "\n".join(sections) + "\n</body>\n</html>\n")
+    _write(os.path.join(out_dir, "index.html"), page)
+
+
+def prerender(store_dir=STORE_DIR, out_dir=OUT_DIR, workers=None, force=False, case_studies=None):
+    """Render every (case study, year, quarter) view whose inputs changed.
+
+    Returns {"rendered": [...], "skipped": n, "seconds": s}.
+    """
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    write_shared_assets(out_dir, store_dir)
+
+    data = StoreData(store_dir)
+
+    previous = {} if force else _load_manifest(out_dir).get("views", {})
+    hashes, tasks, views = {}, [], []
+    for slug in case_studies or CASE_STUDIES:
+        title, table_name, charts_for = CASE_STUDIES[slug]
+        os.makedirs(os.path.join(out_dir, slug), exist_ok=True)
+        for years, quarter in data.index(table_name).periods:
+            path = f"{slug}/{years}-Q{quarter}.html"
+            charts = charts_for(data, years, quarter)
+            hashes[path] = view_hash(charts)
+            views.append((slug, years, quarter, path))
+            if previous.get(path) != hashes[path] or not os.path.exists(os.path.join(out_dir, path)):
+                tasks.append((os.path.join(out_dir, path), f"{title} - {years} Q{quarter}", charts))
+
+    if len(tasks) > 1 and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rendered = list(executor.map(render_view, tasks))
+    else:
+        rendered = [render_view(task) for task in tasks]
+
+    write_index(out_dir, views)
+    _write(os.path.join(out_dir, MANIFEST), json.dumps({"version": RENDER_VERSION, "views": hashes}, indent=1))
+    return {"rendered": rendered, "skipped": len(views) - len(rendered), "seconds": time.perf_counter() - start}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render every case-study view to static HTML")
+    parser.add_argument("--store", default=STORE_DIR)
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (1 = serial)")
+    parser.add_argument("--force", action="store_true", help="re-render views whose inputs did not change")
+    args = parser.parse_args()
+
+    result = prerender(args.store, args.out, args.workers, args.force)
+    print(f"rendered {len(result['rendered'])} views, {result['skipped']} unchanged, "
+          f"in {result['seconds']:.1f}s -> {os.path.join(args.out, 'index.html')}")
@@ -0,0 +1,168 @@
+# PhonePe Pulse query layer
+# Builds parameterized WHERE / GROUP BY queries so the database returns only
+# the aggregated rows a dashboard page plots instead of whole tables.
+
+from pulse_schema import ALL_TABLES
+
+# ========================
+# CONFIGURATION
+# ========================
+AGGREGATES = {"sum": "SUM", "count": "COUNT", "mean": "AVG", "min": "MIN", "max": "MAX"}
+
+# Districts per drill-down page; the keyset query reads one more row to tell
+# whether there is a next page
+DRILL_PAGE_SIZE = 20
+
+
+# ========================
+# VALIDATION
+# ========================
+def _check_table(table_name):
+    if table_name not in ALL_TABLES:
+        raise ValueError(f"Unknown table: {table_name}")
+
+
+def _check_columns(table_name, columns):
+    unknown = [name for name in columns if name not in ALL_TABLES[table_name]["columns"]]
+    if unknown:
+        raise ValueError(f"Unknown columns for {table_name}: {unknown}")
+
+
+def _normalize_measures(measures):
+    """Accept a list of columns (summed) or a {column: aggregate} dict."""
+    if isinstance(measures, dict):
+        return dict(measures)
+    return {name: "sum" for name in measures}
+
+
+# ========================
+# SQL
+# ========================
+def build_filters(years=None, quarter=None, states=None):
+    """WHERE clause and params for the common Years/Quarter/States filters."""
+    conditions, params = [], {}
+    if years is not None:
+        conditions.append("Years = %(years)s")
+        params["years"] = int(years)
+    if quarter is not None:
+        conditions.append("Quarter = %(quarter)s")
+        params["quarter"] = int(quarter)
+    if states is not None:
+        if isinstance(states, str):
+            states = [states]
+        names = [f"state_{i}" for i in range(len(states))]
+        conditions.append(f"States IN ({', '.join(f'%({n})s' for n in names)})")
+        params.update(zip(names, states))
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where, params
+
+
+def build_aggregate_query(table_name, measures, group_by=(), years=None, quarter=None,
+                          states=None, order_by=None, descending=True, limit=None):
+    """Build (sql, params) for a filtered GROUP BY over one table.
+
+    Aggregated columns keep their own names, so results look like the
+    pandas groupby(...).agg(...).reset_index() they replace.
+    """
+    _check_table(table_name)
+    measures = _normalize_measures(measures)
+    group_by = list(group_by)
+    _check_columns(table_name, list(measures) + group_by)
+    unknown = [func for func in measures.values() if func not in AGGREGATES]
+    if unknown:
+        raise ValueError(f"Unknown aggregates: {unknown}")
+    if order_by is not None and order_by not in measures and order_by not in group_by:
+        raise ValueError(f"Cannot order by {order_by}")
+
+    select = group_by + [f"{AGGREGATES[func]}({name}) AS {name}" for name, func in measures.items()]
+    where, params = build_filters(years, quarter, states)
+    sql = f"SELECT {', '.join(select)} FROM {table_name}{where}"
+    if group_by:
+        sql += f" GROUP BY {', '.join(group_by)}"
+    if order_by is not None:
+        sql += f" ORDER BY {order_by} {'DESC' if descending else 'ASC'}"
+    elif group_by:
+        sql += f" ORDER BY {', '.join(group_by)}"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    return sql, params
+
+
+def build_keyset_query(table_name, columns, order_by, key, years=None, quarter=None, states=None,
+                       after=None, descending=True, limit=25):
+    """Build (sql, params) for one page of rows ordered by (order_by, key).
+
+    Keyset pagination: after is (order_by value, key value) of the last row
+    of the previous page, so each page is a range scan from where the last
+    one stopped instead of an OFFSET that re-reads every earlier row. key
+    must be unique within the filtered rows (e.g. District within one state
+    and quarter); rows with a NULL order_by value are skipped.
+    """
+    _check_table(table_name)
+    columns = list(dict.fromkeys(list(columns) + [order_by, key]))
+    _check_columns(table_name, columns)
+
+    where, params = build_filters(years, quarter, states)
+    conditions = [where[len(" WHERE "):]] if where else []
+    op, direction = ("<", "DESC") if descending else (">", "ASC")
+    if order_by == key:
+        order = f"{key} {direction}"
+        if after is not None:
+            conditions.append(f"{key} {op} %(after_key)s")
+            params["after_key"] = after[1]
+    else:
+        order = f"{order_by} {direction}, {key} ASC"
+        conditions.append(f"{order_by} IS NOT NULL")
+        if after is not None:
+            conditions.append(f"({order_by} {op} %(after_value)s OR "
+                              f"({order_by} = %(after_value)s AND {key} > %(after_key)s))")
+            params["after_value"], params["after_key"] = after
+
+    sql = f"SELECT {', '.join(columns)} FROM {table_name}"
+    if conditions:
+        sql += f" WHERE {' AND '.join(conditions)}"
+    sql += f" ORDER BY {order} LIMIT {int(limit)}"
+    return sql, params
+
+
+def build_periods_query(table_name):
+    """Build the query listing the distinct (Years, Quarter) of a table."""
+    _check_table(table_name)
+    return f"SELECT DISTINCT Years, Quarter FROM {table_name} ORDER BY Years, Quarter"
+
+
+# ========================
+# PANDAS FALLBACK
+# ========================
+def aggregate_frame(df, measures, group_by=(), order_by=None, descending=True, limit=None):
+    """Apply the same aggregation to an already filtered DataFrame.
+
+    Used for sources without a SQL engine (the Parquet store).
+    """
+    measures = _normalize_measures(measures)
+    group_by = list(group_by)
+    if group_by:
+        result = df.groupby(group_by, observed=True).agg(measures).reset_index()
+    else:
+        result = df.agg(measures).to_frame().T.reset_index(drop=True)
+    if order_by is not None:
+        result = result.sort_values(order_by, ascending=not descending)
+    if limit is not None:
+        result = result.head(int(limit))
+    return result.reset_index(drop=True)
+
+
+def keyset_frame(df, order_by, key, after=None, descending=True, limit=25):
+    """Same page as build_keyset_query, from an already filtered DataFrame."""
+    if order_by == key:
+        if after is not None:
+            df = df[df[key] < after[1]] if descending else df[df[key] > after[1]]
+        result = df.sort_values(key, ascending=not descending)
+    else:
+        df = df[df[order_by].notna()]
+        if after is not None:
+            value, last_key = after
+            beyond = df[order_by] < value if descending else df[order_by] > value
+            df = df[beyond | ((df[order_by] == value) & (df[key] > last_key))]
+        result = df.sort_values([order_by, key], ascending=[not descending, True])
+    return result.head(int(limit)).reset_index(drop=True)
@@ -0,0 +1,219 @@
+# PhonePe Pulse rollup tables
+# Builds the pre-aggregated tables declared in pulse_schema.ROLLUPS at ingest
+# time, so dashboard renders read a few small rows instead of re-aggregating
+# the raw tables. The Top-N leaderboards (pulse_schema.LEADERBOARDS) are built
+# alongside them.
+
+import numpy as np
+import pandas as pd
+
+from pulse_schema import (ALL_TABLES, LEADERBOARD_DEPTH, LEADERBOARD_TABLE, LEADERBOARDS, ROLLUP_TOTALS,
+                          ROLLUPS, TOTALS_TABLE)
+
+PERIOD = ["Years", "Quarter"]
+
+
+# ========================
+# SQL
+# ========================
+def create_rollup_sql(rollup_name):
+    """CREATE TABLE statement for a rollup, keyed by its group-by columns."""
+    columns = ALL_TABLES[rollup_name]["columns"]
+    if rollup_name in ROLLUPS:
+        group_by = ROLLUPS[rollup_name][1]
+    elif rollup_name == LEADERBOARD_TABLE:
+        group_by = ("Board", "Years", "Quarter", "Position")
+    else:
+        group_by = ("Metric",)
+    body = ",\n".join(f"    {name} {sql_type}" for name, sql_type in columns.items())
+    return f"CREATE TABLE IF NOT EXISTS {rollup_name} (\n{body},\n    PRIMARY KEY ({', '.join(group_by)})\n)"
+
+
+def _rollup_insert_sql(rollup_name, period_filter):
+    source, group_by, measures = ROLLUPS[rollup_name]
+    columns = ", ".join(group_by + measures)
+    select = ", ".join(list(group_by) + [f"SUM({name})" for name in measures])
+    where = " WHERE Years = %s AND Quarter = %s" if period_filter else ""
+    return (f"INSERT INTO {rollup_name} ({columns}) SELECT {select} FROM {source}{where} "
+            f"GROUP BY {', '.join(group_by)}")
+
+
+def _totals_insert_sql():
+    selects = [
+        f"SELECT '{metric}', SUM({column}) FROM {rollup_name}"
+        for metric, (rollup_name, column) in ROLLUP_TOTALS.items()
+    ]
+    return f"INSERT INTO {TOTALS_TABLE} (Metric, Value) " + " UNION ALL ".join(selects)
+
+
+def _leaderboard_insert_sql(board, period_filter, depth=LEADERBOARD_DEPTH):
+    """Rank one board's entities per period with ROW_NUMBER (MySQL 8 / SQLite 3.25+)."""
+    source, entity, measure, divisor = LEADERBOARDS[board]
+    value = f"SUM({measure})"
+    if divisor:
+        value = f"COALESCE(SUM({measure}) * 1.0 / NULLIF(SUM({divisor}), 0), 0)"
+    where = " WHERE Years = %s AND Quarter = %s" if period_filter else ""
+    return (
+        f"INSERT INTO {LEADERBOARD_TABLE} (Board, Years, Quarter, Position, Name, Value) "
+        f"SELECT '{board}', Years, Quarter, Position, Name, Value FROM ("
+        f"SELECT Years, Quarter, {entity} AS Name, {value} AS Value, "
+        f"ROW_NUMBER() OVER (PARTITION BY Years, Quarter ORDER BY {value} DESC, {entity}) AS Position "
+        f"FROM {source}{where} GROUP BY Years, Quarter, {entity}"
+        f") ranked WHERE Position <= {int(depth)}"
+    )
+
+
+def refresh_rollups(conn, periods=None, rollups=None):
+    """Rebuild rollup tables from the loaded base tables in one transaction.
+
+    periods limits the rebuild to a list of (Years, Quarter) pairs, which is
+    what an incremental load touches; by default every period is rebuilt.
+    The grand totals are always recomputed from the (small) period rollups,
+    and the leaderboards of the rebuilt periods after the rollups they rank.
+    """
+    cursor = conn.cursor()
+    try:
+        for rollup_name in list(ROLLUPS) + [TOTALS_TABLE, LEADERBOARD_TABLE]:
+            cursor.execute(create_rollup_sql(rollup_name))
+        for rollup_name in rollups or ROLLUPS:
+            if periods is None:
+                cursor.execute(f"DELETE FROM {rollup_name}")
+                cursor.execute(_rollup_insert_sql(rollup_name, False))
+            else:
+                for years, quarter in periods:
+                    params = (int(years), int(quarter))
+                    cursor.execute(f"DELETE FROM {rollup_name} WHERE Years = %s AND Quarter = %s", params)
+                    cursor.execute(_rollup_insert_sql(rollup_name, True), params)
+        cursor.execute(f"DELETE FROM {TOTALS_TABLE}")
+        cursor.execute(_totals_insert_sql())
+        if periods is None:
+            cursor.execute(f"DELETE FROM {LEADERBOARD_TABLE}")
+            for board in LEADERBOARDS:
+                cursor.execute(_leaderboard_insert_sql(board, False))
+        else:
+            for years, quarter in periods:
+                params = (int(years), int(quarter))
+                cursor.execute(f"DELETE FROM {LEADERBOARD_TABLE} WHERE Years = %s AND Quarter = %s", params)
+                for board in LEADERBOARDS:
+                    cursor.execute(_leaderboard_insert_sql(board, True), params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+# ========================
+# PANDAS (PARQUET STORE)
+# ========================
+def build_rollup_frames(frames):
+    """Compute the rollups from extracted frames, for the Parquet store.
+
+    frames maps base table name -> DataFrame; rollups whose source is not
+    present are skipped, and the totals are only built when every rollup
+    they read is available.
+    """
+    rollups = {}
+    for rollup_name, (source, group_by, measures) in ROLLUPS.items():
+        if source in frames:
+            df = frames[source]
+            rollups[rollup_name] = df.groupby(list(group_by), as_index=False)[list(measures)].sum()
+    rollups = _with_totals(rollups)
+    sources = dict(frames, **rollups)
+    board_sums = {
+        board: _board_sums(sources[source], board)
+        for board, (source, *_) in LEADERBOARDS.items() if source in sources
+    }
+    return _with_leaderboards(rollups, board_sums)
+
+
+def _board_sums(df, board):
+    """Per-period sums of a board's measure (and divisor) for each entity."""
+    _, entity, measure, divisor = LEADERBOARDS[board]
+    measures = [measure] + ([divisor] if divisor else [])
+    return df.groupby(PERIOD + [entity], as_index=False, observed=True)[measures].sum()
+
+
+def rank_leaderboard(board, sums, depth=LEADERBOARD_DEPTH):
+    """Top `depth` entities of each period, as rows of the leaderboard table.
+
+    Ties are broken by name, as in the SQL version.
+    """
+    _, entity, measure, divisor = LEADERBOARDS[board]
+    value = sums[measure].astype("float64")
+    if divisor:
+        value = (value / sums[divisor].astype("float64").replace(0, np.nan)).fillna(0)
+    ranked = pd.DataFrame({
+        "Years": sums["Years"], "Quarter": sums["Quarter"], "Name": sums[entity].astype(str), "Value": value,
+    }).sort_values(PERIOD + ["Value", "Name"], ascending=[True, True, False, True])
+    ranked["Position"] = ranked.groupby(PERIOD).cumcount() + 1
+    ranked = ranked[ranked["Position"] <= depth]
+    return ranked.assign(Board=board)[list(ALL_TABLES[LEADERBOARD_TABLE]["columns"])].reset_index(drop=True)
+
+
+def _with_leaderboards(rollups, board_sums):
+    """Add the leaderboard table ranked from each board's per-period sums."""
+    if board_sums:
+        rollups[LEADERBOARD_TABLE] = pd.concat(
+            [rank_leaderboard(board, board_sums[board]) for board in LEADERBOARDS if board in board_sums],
+            ignore_index=True,
+        )
+    return rollups
+
+
+def _with_totals(rollups):
+    """Add the grand totals table when every rollup it reads is present."""
+    if all(rollup_name in rollups for rollup_name, _ in ROLLUP_TOTALS.values()):
+        totals = [
+            {"Metric": metric, "Value": float(rollups[rollup_name][column].sum())}
+            for metric, (rollup_name, column) in ROLLUP_TOTALS.items()
+        ]
+        rollups[TOTALS_TABLE] = pd.DataFrame(totals, columns=["Metric", "Value"])
+    return rollups
+
+
+class RollupBuilder:
+    """Rollups accumulated batch by batch while base tables stream past.
+
+    Group-by sums combine, so each batch is reduced to its partial sums and
+    the partials are folded together every `fold_every` batches; memory
+    grows with the rollup size, not with the base tables.
+    """
+
+    def __init__(self, fold_every=64):
+        self.fold_every = fold_every
+        self.partials = {}
+
+    def add(self, table_name, df):
+        """Fold one batch of a base table into the rollups and leaderboards built from it."""
+        for rollup_name, (source, group_by, measures) in ROLLUPS.items():
+            if source == table_name:
+                self._add(rollup_name, df.groupby(list(group_by), as_index=False)[list(measures)].sum())
+        for board, (source, *_) in LEADERBOARDS.items():
+            if source == table_name:
+                self._add(board, _board_sums(df, board))
+
+    def _add(self, name, part):
+        parts = self.partials.setdefault(name, [])
+        parts.append(part)
+        if len(parts) >= self.fold_every:
+            self.partials[name] = [self._fold(name)]
+
+    def _fold(self, name):
+        if name in ROLLUPS:
+            _, group_by, measures = ROLLUPS[name]
+        else:
+            _, entity, measure, divisor = LEADERBOARDS[name]
+            group_by, measures = PERIOD + [entity], [measure] + ([divisor] if divisor else [])
+        parts = pd.concat(self.partials[name], ignore_index=True)
+        return parts.groupby(list(group_by), as_index=False, observed=True)[list(measures)].sum()
+
+    def frames(self):
+        """The finished rollups (with totals and leaderboards), like build_rollup_frames."""
+        rollups = _with_totals({name: self._fold(name) for name in self.partials if name in ROLLUPS})
+        board_sums = {name: self._fold(name) for name in self.partials if name in LEADERBOARDS}
+        for board, (source, *_) in LEADERBOARDS.items():
+            if source in rollups:
+                board_sums[board] = _board_sums(rollups[source], board)
+        return _with_leaderboards(rollups, board_sums)
@@ -0,0 +1,305 @@
+# PhonePe Pulse table definitions
+# Shared by the loader notebooks and the Streamlit dashboard
+
+# ========================
+# TABLE DEFINITIONS
+# ========================
+# Every Pulse JSON file holds one (state, year, quarter) of one table.
+KEY_COLUMNS = ("States", "Years", "Quarter")
+
+# Column order matches the exported CSVs and the INSERT statements. The
+# surrogate keys at the end are filled in at ingest from the dimension tables.
+TABLES = {
+    "aggregated_transaction": {
+        "csv": "Agg_Trans.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "Transaction_type": "VARCHAR(50)",
+            "Transaction_count": "BIGINT",
+            "Transaction_amount": "BIGINT",
+            "StateKey": "INT",
+        },
+    },
+    "aggregated_insurance": {
+        "csv": "Agg_Insur.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "Insurance_type": "VARCHAR(50)",
+            "Insurance_count": "BIGINT",
+            "Insurance_amount": "BIGINT",
+            "StateKey": "INT",
+        },
+    },
+    "aggregated_user": {
+        "csv": "Agg_User.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "Brands": "VARCHAR(100)",
+            "Transaction_count": "BIGINT",
+            "Percentage": "FLOAT",
+            "StateKey": "INT",
+        },
+    },
+    "map_insurance": {
+        "csv": "Map_Insur.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "District": "VARCHAR(100)",
+            "Insurance_count": "BIGINT",
+            "Insurance_amount": "BIGINT",
+            "StateKey": "INT",
+            "DistrictKey": "INT",
+        },
+    },
+    "map_transaction": {
+        "csv": "Map_Trans.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "District": "VARCHAR(100)",
+            "Transaction_count": "BIGINT",
+            "Transaction_amount": "BIGINT",
+            "StateKey": "INT",
+            "DistrictKey": "INT",
+        },
+    },
+    "map_user": {
+        "csv": "Map_User.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "District": "VARCHAR(100)",
+            "RegisteredUsers": "BIGINT",
+            "AppOpens": "BIGINT",
+            "StateKey": "INT",
+            "DistrictKey": "INT",
+        },
+    },
+    "top_insurance": {
+        "csv": "Top_Insur.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "Entity_Level": "VARCHAR(20)",
+            "Entity_Name": "VARCHAR(100)",
+            "Insurance_count": "BIGINT",
+            "Insurance_amount": "BIGINT",
+            "StateKey": "INT",
+        },
+    },
+    "top_transaction": {
+        "csv": "Top_Trans.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "Entity_Level": "VARCHAR(20)",
+            "Entity_Name": "VARCHAR(100)",
+            "Transaction_count": "BIGINT",
+            "Transaction_amount": "BIGINT",
+            "StateKey": "INT",
+        },
+    },
+    "top_user": {
+        "csv": "Top_User.csv",
+        "columns": {
+            "States": "VARCHAR(50)",
+            "Years": "INT",
+            "Quarter": "INT",
+            "Entity_Level": "VARCHAR(20)",
+            "Entity_Name": "VARCHAR(100)",
+            "Registered_Users": "BIGINT",
+            "StateKey": "INT",
+        },
+    },
+}
+
+# Dimension tables built at ingest (pulse_dimensions): one row per state,
+# named as in the map GeoJSON, and per district of a state. Their integer
+# keys are stored in the base tables and the per-state rollups.
+STATE_DIM = "dim_state"
+DISTRICT_DIM = "dim_district"
+DIMENSIONS = {
+    STATE_DIM: {
+        "csv": "Dim_State.csv",
+        "columns": {
+            "StateKey": "INT",
+            "States": "VARCHAR(50)",
+        },
+    },
+    DISTRICT_DIM: {
+        "csv": "Dim_District.csv",
+        "columns": {
+            "DistrictKey": "INT",
+            "StateKey": "INT",
+            "District": "VARCHAR(100)",
+        },
+    },
+}
+SURROGATE_KEYS = ("StateKey", "DistrictKey")
+
+
+# Natural primary keys: a Pulse file is one (state, year, quarter) and lists
+# each entity (payment type, brand, district) once. Leading with States
+# keeps one state's quarter together, which is what the district drill-down
+# reads.
+PRIMARY_KEYS = {
+    "aggregated_transaction": KEY_COLUMNS + ("Transaction_type",),
+    "aggregated_insurance": KEY_COLUMNS + ("Insurance_type",),
+    "aggregated_user": KEY_COLUMNS + ("Brands",),
+    "map_insurance": KEY_COLUMNS + ("District",),
+    "map_transaction": KEY_COLUMNS + ("District",),
+    "map_user": KEY_COLUMNS + ("District",),
+    STATE_DIM: ("StateKey",),
+    DISTRICT_DIM: ("DistrictKey",),
+}
+
+# Top entries can have a null entityName in the Pulse JSON, and primary key
+# columns are NOT NULL in MySQL, so the top tables get a unique key instead
+# (which allows NULLs) and no primary key.
+UNIQUE_KEYS = {
+    "top_insurance": KEY_COLUMNS + ("Entity_Level", "Entity_Name"),
+    "top_transaction": KEY_COLUMNS + ("Entity_Level", "Entity_Name"),
+    "top_user": KEY_COLUMNS + ("Entity_Level", "Entity_Name"),
+}
+
+# Secondary indexes: table -> ((index name, columns), ...). Period lookups
+# (dashboard aggregations, period rollup refreshes) filter on Years and
+# Quarter first, then group or filter by state.
+INDEXES = {
+    table_name: ((f"idx_{table_name}_period", ("Years", "Quarter", "States")),)
+    for table_name in TABLES
+}
+
+
+# ========================
+# SQL HELPERS
+# ========================
+def table_columns(table_name):
+    """Return the column names of a table in CSV/INSERT order."""
+    return list(ALL_TABLES[table_name]["columns"])
+
+
+def source_columns(table_name):
+    """Columns of a base table read from the Pulse JSON (all but the surrogate keys)."""
+    return [name for name in TABLES[table_name]["columns"] if name not in SURROGATE_KEYS]
+
+
+def partition_sql(years):
+    """PARTITION BY RANGE (Years) clause: one partition per year plus a catch-all."""
+    partitions = [f"    PARTITION p{y} VALUES LESS THAN ({y + 1})" for y in sorted(set(years))]
+    partitions.append("    PARTITION p_future VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (Years) (\n" + ",\n".join(partitions) + "\n)"
+
+
+def create_table_sql(table_name, partition_years=None):
+    """Build the CREATE TABLE IF NOT EXISTS statement for a base or dimension table.
+
+    The table gets its natural primary key, or unique key for the top
+    tables; with partition_years (MySQL only) it is also RANGE partitioned
+    by Years, which every key includes.
+    """
+    lines = [f"    {name} {sql_type}" for name, sql_type in ALL_TABLES[table_name]["columns"].items()]
+    if table_name in PRIMARY_KEYS:
+        lines.append(f"    PRIMARY KEY ({', '.join(PRIMARY_KEYS[table_name])})")
+    if table_name in UNIQUE_KEYS:
+        lines.append(f"    CONSTRAINT uq_{table_name} UNIQUE ({', '.join(UNIQUE_KEYS[table_name])})")
+    sql = f"CREATE TABLE IF NOT EXISTS {table_name} (\n" + ",\n".join(lines) + "\n)"
+    if partition_years:
+        sql += "\n" + partition_sql(partition_years)
+    return sql
+
+
+def create_index_sql(table_name, index_name, columns):
+    """Build the CREATE INDEX statement for one of a table's INDEXES."""
+    return f"CREATE INDEX {index_name} ON {table_name} ({', '.join(columns)})"
+
+
+def insert_sql(table_name):
+    """Build the parameterized INSERT statement for a table."""
+    columns = table_columns(table_name)
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})"
+
+
+def delete_keys_sql(table_name):
+    """Build the DELETE statement that clears one (States, Years, Quarter) key."""
+    conditions = " AND ".join(f"{name} = %s" for name in KEY_COLUMNS)
+    return f"DELETE FROM {table_name} WHERE {conditions}"
+
+
+# ========================
+# ROLLUP DEFINITIONS
+# ========================
+# Pre-aggregated tables maintained at ingest time:
+# rollup name -> (source table, group-by columns, summed measures).
+# Every rollup is keyed by (Years, Quarter) first so a refresh can be
+# limited to the periods that changed. Per-state rollups carry StateKey,
+# which the maps locate states by.
+ROLLUPS = {
+    "rollup_transaction_state": ("aggregated_transaction", ("Years", "Quarter", "States", "StateKey"), ("Transaction_count", "Transaction_amount")),
+    "rollup_transaction_period": ("aggregated_transaction", ("Years", "Quarter"), ("Transaction_count", "Transaction_amount")),
+    "rollup_transaction_type": ("aggregated_transaction", ("Years", "Quarter", "Transaction_type"), ("Transaction_count", "Transaction_amount")),
+    "rollup_insurance_state": ("aggregated_insurance", ("Years", "Quarter", "States", "StateKey"), ("Insurance_count", "Insurance_amount")),
+    "rollup_insurance_period": ("aggregated_insurance", ("Years", "Quarter"), ("Insurance_count", "Insurance_amount")),
+    "rollup_brand": ("aggregated_user", ("Years", "Quarter", "Brands"), ("Transaction_count",)),
+    "rollup_map_transaction_state": ("map_transaction", ("Years", "Quarter", "States", "StateKey"), ("Transaction_count", "Transaction_amount")),
+    "rollup_map_user_state": ("map_user", ("Years", "Quarter", "States", "StateKey"), ("RegisteredUsers", "AppOpens")),
+    "rollup_top_user_period": ("top_user", ("Years", "Quarter"), ("Registered_Users",)),
+}
+
+# Grand totals, one row per metric: metric -> (period rollup, column)
+ROLLUP_TOTALS = {
+    "Transaction_count": ("rollup_transaction_period", "Transaction_count"),
+    "Transaction_amount": ("rollup_transaction_period", "Transaction_amount"),
+    "Insurance_amount": ("rollup_insurance_period", "Insurance_amount"),
+    "Registered_Users": ("rollup_top_user_period", "Registered_Users"),
+}
+TOTALS_TABLE = "rollup_totals"
+
+# Top-N leaderboards precomputed per (Years, Quarter) next to the rollups:
+# board -> (source table, ranked entity column, summed measure, divisor or
+# None). The value is SUM(measure), or SUM(measure) / SUM(divisor) for a
+# ratio; the top LEADERBOARD_DEPTH entities of each period are stored.
+LEADERBOARDS = {
+    "states_by_amount": ("rollup_transaction_state", "States", "Transaction_amount", None),
+    "payment_types_by_count": ("rollup_transaction_type", "Transaction_type", "Transaction_count", None),
+    "brands_by_count": ("rollup_brand", "Brands", "Transaction_count", None),
+    "districts_by_app_opens": ("map_user", "District", "AppOpens", None),
+    "states_by_engagement": ("rollup_map_user_state", "States", "AppOpens", "RegisteredUsers"),
+}
+LEADERBOARD_TABLE = "rollup_leaderboard"
+LEADERBOARD_DEPTH = 25
+
+
+def rollup_columns(rollup_name):
+    """Column -> SQL type of a rollup table, taken from its source table."""
+    source, group_by, measures = ROLLUPS[rollup_name]
+    source_types = TABLES[source]["columns"]
+    return {name: source_types[name] for name in group_by + measures}
+
+
+# Every table the query layer may read: base tables, dimensions and rollups
+ALL_TABLES = dict(TABLES)
+ALL_TABLES.update(DIMENSIONS)
+ALL_TABLES.update({name: {"columns": rollup_columns(name)} for name in ROLLUPS})
+ALL_TABLES[TOTALS_TABLE] = {"columns": {"Metric": "VARCHAR(50)", "Value": "DOUBLE"}}
+ALL_TABLES[LEADERBOARD_TABLE] = {"columns": {
+    "Board": "VARCHAR(50)",
+    "Years": "INT",
+    "Quarter": "INT",
+    "Position": "INT",
+    "Name": "VARCHAR(100)",
+    "Value": "DOUBLE",
+}}
@@ -0,0 +1,137 @@
+# PhonePe Pulse shared table cache
+# Lets several dashboard processes (Streamlit workers behind a load balancer)
+# share one copy of each loaded table. The first process to need a table
+# reads it from the data source and writes it to a local directory as an
+# uncompressed Arrow IPC file; every process then memory-maps that file
+# read-only, so the column buffers live once in the OS page cache instead of
+# once per worker. A lock file per entry makes concurrent cold starts wait
+# for the process already loading a table instead of all querying MySQL.
+
+import hashlib
+import os
+import time
+
+import pyarrow as pa
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# ========================
+# CONFIGURATION
+# ========================
+# Directory of the shared entries; empty leaves every process with its own
+# private cache. All workers of one dashboard must point at the same path.
+SHARED_CACHE_DIR = os.environ.get("PHONEPE_SHARED_CACHE_DIR", "")
+
+
+# ========================
+# FILE LOCK
+# ========================
+class FileLock:
+    """Exclusive inter-process lock on a file, held for a `with` block."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.path, "a+b")
+        if os.name == "nt":
+            self.file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after ~10s; keep waiting for the loader
+                    continue
+        else:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if os.name == "nt":
+            self.file.seek(0)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        self.file.close()
+        self.file = None
+
+
+# ========================
+# CACHE
+# ========================
+class SharedTableCache:
+    """Arrow files in cache_dir, one per cache key, shared by every process.
+
+    An entry is fresh for ttl seconds after it was written. get_or_load
+    returns a fresh entry memory-mapped, or loads, writes and then maps it
+    under the entry's lock. loads and attaches count this process's source
+    loads and reads of entries written by any process.
+    """
+
+    def __init__(self, cache_dir=SHARED_CACHE_DIR, ttl=3600):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.loads = 0
+        self.attaches = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key):
+        """Entry file of a cache key: <table>-<sha1 of the key>.arrow."""
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()[:16]
+        name = key[1] if isinstance(key, tuple) and len(key) > 1 else "entry"
+        return os.path.join(self.cache_dir, f"{name}-{digest}.arrow")
+
+    def is_fresh(self, path):
+        try:
+            return time.time() - os.stat(path).st_mtime < self.ttl
+        except FileNotFoundError:
+            return False
+
+    def read(self, path):
+        """Memory-map an entry; the frame's buffers point into the shared pages."""
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        self.attaches += 1
+        # split_blocks keeps one block per column, so columns without nulls
+        # stay zero-copy views of the mapping instead of being consolidated
+        return table.to_pandas(split_blocks=True)
+
+    def write(self, path, df):
+        """Write an entry atomically: readers see the old file or the new one."""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+
+    def get_or_load(self, key, loader):
+        """The frame for key, loading it with loader() if no process has yet.
+
+        Processes that miss at the same time queue on the entry's lock; the
+        first loads, the others find the fresh entry once it is released.
+        Errors from loader propagate and nothing is written.
+        """
+        path = self.path(key)
+        if self.is_fresh(path):
+            return self.read(path)
+        with FileLock(path + ".lock"):
+            if not self.is_fresh(path):
+                df = loader()
+                self.loads += 1
+                try:
+                    self.write(path, df)
+                except PermissionError:
+                    # Windows cannot replace a file another process has mapped;
+                    # serve this load unshared until the old entry is released
+                    return df
+        return self.read(path)
+
+
+def shared_cache(ttl=3600):
+    """The cache at PHONEPE_SHARED_CACHE_DIR, or None when it is not set."""
+    return SharedTableCache(SHARED_CACHE_DIR, ttl) if SHARED_CACHE_DIR else None
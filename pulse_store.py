@@ -0,0 +1,179 @@
+# PhonePe Pulse columnar store
+# Parquet hand-off between extraction and loading, partitioned by table and
+# year: exported_parquet/<table>/Years=<year>/*.parquet. Columns are typed
+# from pulse_schema so readers skip CSV text parsing and type inference.
+
+import os
+import shutil
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from pulse_rollups import build_rollup_frames
+from pulse_schema import ALL_TABLES
+
+# ========================
+# CONFIGURATION
+# ========================
+STORE_DIR = "exported_parquet"
+
+# MySQL column type -> Arrow type
+ARROW_TYPES = {
+    "INT": pa.int32(),
+    "BIGINT": pa.int64(),
+    "FLOAT": pa.float32(),
+    "DOUBLE": pa.float64(),
+}
+
+PARTITIONING = ds.partitioning(pa.schema([("Years", pa.int32())]), flavor="hive")
+
+
+# ========================
+# SCHEMAS
+# ========================
+def arrow_type(sql_type):
+    """Arrow type for a MySQL column type; VARCHAR(n) maps to string."""
+    if sql_type.startswith("VARCHAR"):
+        return pa.string()
+    return ARROW_TYPES[sql_type]
+
+
+def table_schema(table_name):
+    """Explicit Arrow schema matching the MySQL table."""
+    return pa.schema([
+        (name, arrow_type(sql_type)) for name, sql_type in ALL_TABLES[table_name]["columns"].items()
+    ])
+
+
+def to_arrow(df, table_name):
+    """Convert an extracted DataFrame to an Arrow table with the declared schema.
+
+    BIGINT columns are rounded first, the same way MySQL stores the
+    fractional amounts found in the Pulse JSON.
+    """
+    columns = ALL_TABLES[table_name]["columns"]
+    df = df[list(columns)].copy()
+    for name, sql_type in columns.items():
+        if sql_type == "BIGINT" and df[name].dtype.kind == "f":
+            df[name] = df[name].round().astype("Int64")
+    return pa.Table.from_pandas(df, schema=table_schema(table_name), preserve_index=False)
+
+
+def _partitioning(table_name):
+    """Year partitioning for every table that has a Years column."""
+    return PARTITIONING if "Years" in ALL_TABLES[table_name]["columns"] else None
+
+
+# ========================
+# WRITE / READ
+# ========================
+def table_dir(table_name, store_dir=STORE_DIR):
+    return os.path.join(store_dir, table_name)
+
+
+def has_table(table_name, store_dir=STORE_DIR):
+    """True if the store holds a table."""
+    return os.path.isdir(table_dir(table_name, store_dir))
+
+
+def write_table(df, table_name, store_dir=STORE_DIR):
+    """Replace a table in the store, one Parquet partition per year."""
+    path = table_dir(table_name, store_dir)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    ds.write_dataset(
+        to_arrow(df, table_name),
+        path,
+        format="parquet",
+        partitioning=_partitioning(table_name),
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def export_parquet(frames, store_dir=STORE_DIR, rollups=True):
+    """Write every extracted frame to the store, plus the rollups built from them."""
+    if rollups:
+        frames = dict(frames, **build_rollup_frames(frames))
+    for table_name, df in frames.items():
+        write_table(df, table_name, store_dir)
+
+
+class TableWriter:
+    """Write a table to the store chunk by chunk (for streamed extraction).
+
+    Each chunk is split by year and appended as row groups to one Parquet
+    file per Years partition, so only the current chunk is held in memory.
+    The layout matches write_table's, and the table is replaced on open.
+    """
+
+    def __init__(self, table_name, store_dir=STORE_DIR):
+        self.path = table_dir(table_name, store_dir)
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        os.makedirs(self.path)
+        self.table_name = table_name
+        self.schema = table_schema(table_name)
+        self.partitioned = _partitioning(table_name) is not None
+        self.rows = 0
+        self.writers = {}
+
+    def write(self, df):
+        """Append one DataFrame chunk."""
+        chunk = to_arrow(df, self.table_name)
+        self.rows += chunk.num_rows
+        if not self.partitioned:
+            self._writer(None).write_table(chunk)
+            return
+        for years in pc.unique(chunk["Years"]).to_pylist():
+            part = chunk.filter(pc.equal(chunk["Years"], years)).drop_columns(["Years"])
+            self._writer(years).write_table(part)
+
+    def _writer(self, years):
+        if years not in self.writers:
+            directory = self.path
+            schema = self.schema
+            if years is not None:
+                directory = os.path.join(self.path, f"Years={years}")
+                schema = schema.remove(schema.get_field_index("Years"))
+            os.makedirs(directory, exist_ok=True)
+            self.writers[years] = pq.ParquetWriter(os.path.join(directory, "part-0.parquet"), schema)
+        return self.writers[years]
+
+    def close(self):
+        """Finish the files; returns rows written."""
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_table(table_name, columns=None, years=None, quarter=None, store_dir=STORE_DIR):
+    """Read a table from the store via memory-mapping.
+
+    Only the requested columns are decoded and only the Years partitions
+    (and row groups) matching the filters are touched.
+    """
+    filters = []
+    if years is not None:
+        filters.append(("Years", "=", int(years)))
+    if quarter is not None:
+        filters.append(("Quarter", "=", int(quarter)))
+
+    table = pq.read_table(
+        table_dir(table_name, store_dir),
+        columns=list(columns) if columns else None,
+        filters=filters or None,
+        partitioning=_partitioning(table_name),
+        memory_map=True,
+    )
+    df = table.to_pandas(ignore_metadata=True)
+    order = [name for name in (columns or ALL_TABLES[table_name]["columns"]) if name in df.columns]
+    return df[order]
@@ -0,0 +1,97 @@
+# Growth metrics over (Years, Quarter)
+# Vectorized quarter-over-quarter, year-over-year, rolling and cumulative
+# figures per group (state, payment type, ...) for the period rollups, built
+# once and served from the dashboard caches.
+
+import numpy as np
+
+# ========================
+# PERIODS
+# ========================
+QUARTERS_PER_YEAR = 4
+
+
+def period_number(years, quarter):
+    """Consecutive quarter number: (2018, 4) -> 8075, (2019, 1) -> 8076."""
+    return years.astype("int32") * QUARTERS_PER_YEAR + quarter.astype("int32") - 1
+
+
+def period_label(years, quarter):
+    """'2023 Q4' labels for Series of years and quarters."""
+    return years.astype(str) + " Q" + quarter.astype(str)
+
+
+# ========================
+# METRICS
+# ========================
+def _lagged(df, keys, measures, periods):
+    """Each row's measures from `periods` quarters earlier (NaN if missing).
+
+    Aligned on the period number rather than by position, so a missing
+    quarter never shifts later comparisons.
+    """
+    earlier = df[keys + measures].assign(Period_No=df["Period_No"] + periods)
+    return df[keys].merge(earlier, on=keys, how="left")[measures]
+
+
+def _growth(current, previous):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (current.to_numpy(dtype="float64") / previous.to_numpy(dtype="float64") - 1) * 100
+    return np.where(np.isfinite(growth), growth, np.nan)
+
+
+def build_time_series(df, measures, by=(), window=4):
+    """Add growth columns to a per-period (and optionally per-group) frame.
+
+    For every measure M the result has M_QoQ and M_YoY (% change against the
+    previous quarter / same quarter last year), M_Rolling (mean of the last
+    `window` quarters on record) and M_Cumulative (running total), computed
+    per group of `by`. Rows come back sorted by group then period, with
+    Period_No and a "Period" label column.
+    """
+    by = list(by)
+    measures = list(measures)
+    keys = by + ["Period_No"]
+    series = df.assign(
+        Period_No=period_number(df["Years"], df["Quarter"]),
+        Period=period_label(df["Years"], df["Quarter"]),
+    ).sort_values(keys, ignore_index=True)
+
+    previous_quarter = _lagged(series, keys, measures, 1)
+    previous_year = _lagged(series, keys, measures, QUARTERS_PER_YEAR)
+    grouped = series.groupby(by, observed=True, sort=False)[measures] if by else series[measures]
+    rolling = grouped.rolling(window, min_periods=1).mean()
+    if by:
+        rolling = rolling.reset_index(level=list(range(len(by))), drop=True).sort_index()
+    cumulative = grouped.cumsum()
+
+    columns = {}
+    for name in measures:
+        columns[f"{name}_QoQ"] = _growth(series[name], previous_quarter[name])
+        columns[f"{name}_YoY"] = _growth(series[name], previous_year[name])
+        columns[f"{name}_Rolling"] = rolling[name].to_numpy()
+        columns[f"{name}_Cumulative"] = cumulative[name].to_numpy()
+    return series.assign(**columns)
+
+
+# ========================
+# GROWTH LEADERS
+# ========================
+def growth_leaders(series, years, quarter, measure, n=10):
+    """Top n rows of a period by growth score, and the (Years, Quarter) they are from.
+
+    series is a PeriodIndex of build_time_series output. The score
+    (Growth_Score) is the YoY % change of measure, or QoQ where a group has
+    no figure a year back. The first quarters on record have nothing
+    earlier to compare with, so when the period has no scores the first
+    later period that does is used. Rows are empty if none has.
+    """
+    selected = (int(years), int(quarter))
+    periods = [selected] + [p for p in series.periods if p > selected] if not series.empty else []
+    for period in periods:
+        df = series.get(*period)
+        df["Growth_Score"] = df[f"{measure}_YoY"].fillna(df[f"{measure}_QoQ"])
+        top = df.dropna(subset=["Growth_Score"]).nlargest(n, "Growth_Score")
+        if not top.empty:
+            return top, period
+    return series.get(*selected).assign(Growth_Score=np.nan), selected